@@ -1,6 +1,11 @@
 import hashlib
 import time
 import json
+import mmap
+import functools
+import threading
+import heapq
+import sys
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -11,10 +16,28 @@ try:
 except ImportError:
     TELEGRAM_ENABLED = False
     print("Telegram bot not available - notifications disabled")
-from dataclasses import dataclass, asdict
-import pickle
+from dataclasses import dataclass, field
 import re
 
+# Slotted dataclasses (no per-instance __dict__) where supported (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+def _cache_field():
+    """Dataclass field for a per-instance cache: not an init argument, ignored by repr/eq"""
+    return field(default=None, init=False, repr=False, compare=False)
+
+# Optional fast JSON parser for large blockchain files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional binary format for bundled/initial blockchain files (*.msgpack)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Authorized mining addresses - mining rewards and fees go to the address that unlocked mining
 AUTHORIZED_MINING_ADDRESSES = [
     "GSC1705641e65321ef23ac5fb3d470f39627",
@@ -24,7 +47,14 @@ AUTHORIZED_MINING_ADDRESSES = [
 # Current active mining address (set when mining is unlocked)
 CURRENT_MINING_ADDRESS = None
 
-@dataclass
+@functools.lru_cache(maxsize=64)
+def _reward_for_era(initial_reward: float, halving_count: int) -> float:
+    """Block reward for a halving era (constant for the whole era)"""
+    if halving_count >= 64:  # After 64 halvings, reward becomes 0
+        return 0
+    return initial_reward / (2 ** halving_count)
+
+@dataclass(**_SLOTS)
 class Transaction:
     """GSC Coin Transaction Class"""
     sender: str
@@ -34,6 +64,10 @@ class Transaction:
     timestamp: float
     signature: str = ""
     tx_id: str = ""
+    source: str = field(default="", init=False, repr=False, compare=False)  # Set by the wallet GUI
+    _dict_cache: tuple = _cache_field()  # (tx_id, signature, to_dict() result)
+    _mempool_seq: int = _cache_field()  # Assigned by GSCBlockchain.mempool_page
+    _wire_json: tuple = _cache_field()  # (tx_id, signature, encoded to_dict()) for the network
     
     def __post_init__(self):
         if not self.tx_id:
@@ -45,7 +79,23 @@ class Transaction:
         return hashlib.sha256(tx_string.encode()).hexdigest()
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Flat fields only, so a literal dict avoids asdict()'s recursive deepcopy; the dict is
+        # built once and reused until the id or signature changes (treat it as read-only)
+        cached = self._dict_cache
+        if cached and cached[0] == self.tx_id and cached[1] == self.signature:
+            return cached[2]
+        
+        tx_dict = {
+            'sender': self.sender,
+            'receiver': self.receiver,
+            'amount': self.amount,
+            'fee': self.fee,
+            'timestamp': self.timestamp,
+            'signature': self.signature,
+            'tx_id': self.tx_id
+        }
+        self._dict_cache = (self.tx_id, self.signature, tx_dict)
+        return tx_dict
     
     def is_valid(self) -> bool:
         """Validate transaction"""
@@ -57,7 +107,7 @@ class Transaction:
             return False
         return True
 
-@dataclass
+@dataclass(**_SLOTS)
 class Block:
     """GSC Coin Block Class"""
     index: int
@@ -70,6 +120,12 @@ class Block:
     difficulty: int = 4
     miner: str = ""
     reward: float = 50.0
+    # Network wire-format caches, each (hash, value) so a re-hashed block is re-serialized
+    _wire_dict: tuple = _cache_field()
+    _wire_frame: tuple = _cache_field()
+    _wire_frame_zstd: tuple = _cache_field()
+    _wire_header: tuple = _cache_field()
+    _wire_header_json: tuple = _cache_field()
     
     def __post_init__(self):
         if not self.merkle_root:
@@ -222,6 +278,16 @@ class GSCBlockchain:
         self.network_node = None
         self.block_height = 0
         self.nodes = []  # Initialize nodes list for network connectivity
+        self.version = 0  # Bumped whenever chain or mempool changes (lets the GUI skip redraws)
+        
+        # block hash -> chain position, extended lazily as the chain grows
+        self._hash_index = {}
+        self._hash_indexed = 0
+        self._hash_index_lock = threading.Lock()
+        
+        # Serializes mempool admission (peer workers validate and insert concurrently)
+        self._mempool_lock = threading.RLock()
+        self._mempool_seq = 0  # Last sequence number handed out by mempool_page
         
         # GSC reward system
         self.initial_reward = 50.0  # Starting reward
@@ -242,9 +308,7 @@ class GSCBlockchain:
             return self.initial_reward
         
         halving_count = (self.block_height - 1) // self.halving_interval  # Adjust for genesis block
-        if halving_count >= 64:  # After 64 halvings, reward becomes 0
-            return 0
-        return self.initial_reward / (2 ** halving_count)
+        return _reward_for_era(self.initial_reward, halving_count)
     
     def create_genesis_block(self):
         print("Creating GSC Coin Genesis Block...")
@@ -292,11 +356,26 @@ class GSCBlockchain:
         """Get the latest block in the chain"""
         return self.chain[-1]
 
-    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
-        for b in self.chain:
-            if b.hash == block_hash:
-                return b
+    def get_block_index(self, block_hash: str) -> Optional[int]:
+        """Chain position of the block with this hash, or None (O(1) via the hash index)"""
+        chain = self.chain
+        with self._hash_index_lock:
+            indexed = self._hash_indexed
+            # Blocks link by hash, so if the last indexed block is unchanged the whole prefix is
+            if indexed > len(chain) or (indexed and self._hash_index.get(chain[indexed - 1].hash) != indexed - 1):
+                self._hash_index.clear()
+                indexed = 0
+            for i in range(indexed, len(chain)):
+                self._hash_index[chain[i].hash] = i
+            self._hash_indexed = len(chain)
+            i = self._hash_index.get(block_hash)
+        if i is not None and i < len(chain) and chain[i].hash == block_hash:
+            return i
         return None
+    
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        i = self.get_block_index(block_hash)
+        return self.chain[i] if i is not None else None
 
     def get_transaction_by_hash(self, tx_id: str):
         """Return (tx, block_height) or None. block_height=-1 means mempool."""
@@ -311,6 +390,39 @@ class GSCBlockchain:
     
     def add_transaction_to_mempool(self, transaction: Transaction) -> bool:
         """Add transaction to mempool with comprehensive GSC protocol validation"""
+        with self._mempool_lock:
+            return self._admit_to_mempool(transaction)
+    
+    def add_transactions_to_mempool(self, transactions: List[Transaction]) -> int:
+        """Add a batch of transactions under one mempool lock; returns how many were accepted"""
+        added_count = 0
+        with self._mempool_lock:
+            # Drop ids already pooled or repeated within the batch before the full chain scans
+            seen_ids = {tx.tx_id for tx in self.mempool}
+            for transaction in transactions:
+                if transaction.tx_id in seen_ids:
+                    continue
+                seen_ids.add(transaction.tx_id)
+                if self._admit_to_mempool(transaction):
+                    added_count += 1
+        return added_count
+    
+    def mempool_page(self, since: int = 0, limit: int = 500) -> List[tuple]:
+        """Up to limit (seq, tx) pairs for mempool transactions numbered after since, oldest first"""
+        with self._mempool_lock:
+            page = []
+            for tx in self.mempool:
+                # Numbered on first sight so every insertion path is covered
+                seq = tx._mempool_seq
+                if seq is None:
+                    self._mempool_seq += 1
+                    seq = tx._mempool_seq = self._mempool_seq
+                if seq > since:
+                    page.append((seq, tx))
+        return heapq.nsmallest(limit, page, key=lambda item: item[0])
+    
+    def _admit_to_mempool(self, transaction: Transaction) -> bool:
+        """Validate and insert one transaction (caller holds _mempool_lock)"""
         try:
             print(f"🔍 Validating transaction for mempool: {transaction.tx_id[:16]}...")
             
@@ -337,12 +449,17 @@ class GSCBlockchain:
                 print(f"❌ INVALID TRANSACTION: Invalid fee: {transaction.fee}")
                 return False
             
-            # 4. Check for duplicate transaction ID in entire blockchain
-            if self.is_transaction_duplicate(transaction):
-                print(f"❌ INVALID TRANSACTION: Duplicate transaction detected in blockchain")
+            # 4. Timestamp validation (cheap, so before any chain or mempool scan)
+            current_time = time.time()
+            
+            # Allow transactions from 24 hours ago to 5 minutes in the future
+            if (transaction.timestamp > current_time + 300 or 
+                transaction.timestamp < current_time - 86400):
+                print(f"❌ INVALID TRANSACTION: Invalid timestamp: {transaction.timestamp}")
                 return False
             
-            # 5. Check for duplicate transactions in mempool
+            # 5. Check for duplicate transactions in mempool (relayed duplicates stop here,
+            # before the full-chain scans below)
             for existing_tx in self.mempool:
                 if existing_tx.tx_id == transaction.tx_id:
                     print(f"❌ INVALID TRANSACTION: Duplicate transaction in mempool")
@@ -356,7 +473,12 @@ class GSCBlockchain:
                     print(f"❌ INVALID TRANSACTION: Identical transaction already in mempool")
                     return False
             
-            # 6. Balance validation (skip for coinbase transactions)
+            # 6. Duplicate ID or replay of an identical transaction anywhere in the blockchain
+            if self.is_transaction_duplicate(transaction):
+                print(f"❌ INVALID TRANSACTION: Duplicate transaction detected in blockchain")
+                return False
+            
+            # 7. Balance validation (skip for coinbase transactions)
             if transaction.sender not in ["COINBASE", "GENESIS", "Genesis"]:
                 sender_balance = self.get_balance(transaction.sender)
                 required_amount = transaction.amount + transaction.fee
@@ -365,33 +487,14 @@ class GSCBlockchain:
                     print(f"❌ INVALID TRANSACTION: Insufficient balance: {sender_balance} < {required_amount}")
                     return False
             
-            # 7. Comprehensive double spending check
+            # 8. Comprehensive double spending check
             if self.check_double_spending_comprehensive(transaction):
                 print(f"❌ INVALID TRANSACTION: Double spending detected")
                 return False
             
-            # 8. Timestamp validation
-            import time
-            current_time = time.time()
-            
-            # Allow transactions from 24 hours ago to 5 minutes in the future
-            if (transaction.timestamp > current_time + 300 or 
-                transaction.timestamp < current_time - 86400):
-                print(f"❌ INVALID TRANSACTION: Invalid timestamp: {transaction.timestamp}")
-                return False
-            
-            # 9. Replay attack prevention - check against all blockchain history
-            for block in self.chain:
-                for tx in block.transactions:
-                    if (tx.sender == transaction.sender and 
-                        tx.receiver == transaction.receiver and 
-                        tx.amount == transaction.amount and 
-                        abs(tx.timestamp - transaction.timestamp) < 1.0):
-                        print(f"❌ INVALID TRANSACTION: Replay attack detected - identical transaction found in blockchain")
-                        return False
-            
             # All validations passed - add to mempool
             self.mempool.append(transaction)
+            self.version += 1
             print(f"✅ Transaction added to mempool successfully")
             return True
             
@@ -830,6 +933,7 @@ class GSCBlockchain:
             
             if synchronized_chain and (len(synchronized_chain) > len(self.chain) or synchronized_chain != self.chain):
                 self.chain = synchronized_chain
+                self.version += 1
                 self.update_balances()
                 self.block_height = len(self.chain) - 1
                 # Update current supply after sync
@@ -880,19 +984,29 @@ class GSCBlockchain:
             best_chain = None
             best_height = len(self.chain)
             
-            for peer in self.network_node.peers:
+            for peer in list(self.network_node.peers):
                 try:
                     peer_chain_info = self.network_node.request_blockchain_info(peer)
                     if peer_chain_info and peer_chain_info['height'] > best_height:
-                        peer_chain = self.network_node.request_full_blockchain(peer)
+                        # Blocks are rebuilt and linked as they stream in, so a peer sending a
+                        # broken chain is dropped before the rest of it is downloaded
+                        deserialize_block = self.network_node.deserialize_block
+                        peer_chain = []
+                        for block_data in self.network_node.iter_full_blockchain(peer):
+                            block = deserialize_block(block_data)
+                            if peer_chain and block.previous_hash != peer_chain[-1].hash:
+                                raise ValueError(f"block {block.index} does not link to block {peer_chain[-1].index}")
+                            peer_chain.append(block)
                         if peer_chain and self.validate_imported_chain(peer_chain):
                             best_chain = peer_chain
                             best_height = len(peer_chain)
                 except Exception as e:
                     print(f"Error syncing with peer {peer}: {e}")
             
-            if best_chain:
+            # Our own chain may have grown while peers were queried
+            if best_chain and len(best_chain) > len(self.chain):
                 self.chain = best_chain
+                self.version += 1
                 self.update_balances()
                 self.block_height = len(self.chain) - 1
                 print(f"Blockchain synced - new height: {self.block_height}")
@@ -993,6 +1107,7 @@ class GSCBlockchain:
         
         # Remove invalid transactions from mempool
         self.mempool = valid_transactions
+        self.version += 1
         
         if invalid_count > 0:
             print(f"🧹 Removed {invalid_count} INVALID TRANSACTIONS from mempool")
@@ -1043,6 +1158,7 @@ class GSCBlockchain:
                         self.mempool.remove(tx)
                         mined_tx_count += 1
                 
+                self.version += 1
                 print(f"🧹 Removed {mined_tx_count} mined transactions from mempool")
                 
                 self.mining_stats = mining_stats
@@ -1080,6 +1196,7 @@ class GSCBlockchain:
         
         if block.is_valid(previous_block):
             self.chain.append(block)
+            self.version += 1
             self.update_balances()
             # Update current supply after adding block
             self.update_current_supply()
@@ -1163,6 +1280,7 @@ class GSCBlockchain:
                     if tx in self.mempool:
                         self.mempool.remove(tx)
                         mined_count += 1
+                self.version += 1
                 
                 print(f"✅ Manual block {new_block.index} added successfully with {mined_count} transactions!")
                 self.block_height = len(self.chain) - 1
@@ -1215,6 +1333,7 @@ class GSCBlockchain:
         if removed_blocks > 0:
             print(f"🧹 Removed {removed_blocks} INVALID BLOCKS from blockchain")
             self.chain = valid_chain
+            self.version += 1
             self.block_height = len(self.chain) - 1
             print(f"   New blockchain height: {self.block_height}")
         
@@ -1282,6 +1401,7 @@ class GSCBlockchain:
         if len(new_chain) > len(self.chain) and self.is_chain_valid_network(new_chain):
             print(f"Replacing chain with longer valid chain ({len(new_chain)} blocks)")
             self.chain = new_chain
+            self.version += 1
             self.update_balances()
             self.block_height = len(self.chain) - 1 if self.chain else 0
             return True
@@ -1497,16 +1617,36 @@ class GSCBlockchain:
             'mining_reward': self.mining_reward
         }
         
-        with open(filename, 'w') as f:
-            json.dump(blockchain_data, f, indent=2)
+        # Serialize once and hand the whole buffer to a single write
+        if filename.endswith('.msgpack'):
+            if msgpack is None:
+                raise RuntimeError("msgpack is required to save .msgpack blockchain files")
+            payload = msgpack.packb(blockchain_data, use_bin_type=True)
+        elif orjson:
+            payload = orjson.dumps(blockchain_data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        else:
+            payload = json.dumps(blockchain_data, indent=2).encode()
+        
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            f.write(payload)
         
         print(f"GSC Blockchain saved to {filename}")
     
     def load_blockchain(self, filename: str):
         """Load blockchain from file"""
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            # Parse straight from a read-only mapping instead of read() into an intermediate string
+            with open(filename, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if filename.endswith('.msgpack'):
+                        if msgpack is None:
+                            raise RuntimeError("msgpack is required to load .msgpack blockchain files")
+                        data = msgpack.unpackb(mm, raw=False)
+                    elif orjson:
+                        with memoryview(mm) as view:
+                            data = orjson.loads(view)
+                    else:
+                        data = json.loads(mm[:])
             
             # Reconstruct blockchain
             self.chain.clear()
@@ -1537,6 +1677,7 @@ class GSCBlockchain:
             self.mining_reward = data.get('mining_reward', 50.0)
 
             # Update blockchain state
+            self.version += 1
             self.block_height = len(self.chain) - 1
             self.update_balances()
             # Update current supply after loading
@@ -1,18 +1,60 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
 import threading
+import queue
 import time
 import json
 import sys
 import os
+import subprocess
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import hashlib
 import base64
+
+# QR support is optional
+try:
+    import qrcode
+    from PIL import Image, ImageTk
+    _HAS_QR = True
+except ImportError:
+    _HAS_QR = False
+
 from blockchain import GSCBlockchain, Transaction, Block
 from wallet_manager import WalletManager
 from paper_wallet_generator import PaperWalletGenerator
 from telegram_bot import TelegramBot
 
+# Sections refreshed by update_displays() when no explicit dirty set is given
+DISPLAY_SECTIONS = frozenset({"balance", "address", "mempool", "blockchain", "history", "network", "supply"})
+
+def _copy_if_changed(src, dst_dir):
+    """Copy src into dst_dir unless an identical (size + mtime) copy is already there"""
+    dst = os.path.join(dst_dir, os.path.basename(src))
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+        if src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime):
+            return False
+    except FileNotFoundError:
+        pass
+    shutil.copy2(src, dst)
+    return True
+
+def _open_folder(path):
+    """Open a folder in the system file browser without blocking the Tk thread"""
+    try:
+        path = os.path.abspath(path)
+        if sys.platform == 'win32':
+            subprocess.Popen(['explorer', path], close_fds=True, creationflags=subprocess.DETACHED_PROCESS)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', path], close_fds=True)
+        else:
+            subprocess.Popen(['xdg-open', path], close_fds=True)
+    except Exception as e:
+        print(f"⚠️ Could not open folder {path}: {e}")
+
 class GSCWalletGUI:
     def __init__(self, blockchain=None, network_node=None):
         self.root = tk.Tk()
@@ -52,6 +94,20 @@ class GSCWalletGUI:
         self.current_mining_address = None  # No mining address unlocked initially
         self.mining_unlocked = False
         
+        # Results posted by worker threads, applied on the Tk thread by _drain_ui_queue
+        self._ui_queue = queue.Queue()
+        
+        # Blockchain version shown by the last full refresh, and the (is_mining, peer count)
+        # last seen by update_loop
+        self._displayed_version = None
+        self._displayed_network = None
+        
+        # QR PhotoImages by address, reused across show_address_qr windows
+        self._qr_photo_cache = {}
+        
+        # (blockchain version, is_mining, text) of the last getblockchaininfo console output
+        self._cached_info_json = None
+        
         # Create menu system first
         self.create_menu_system()
         
@@ -68,6 +124,26 @@ class GSCWalletGUI:
         self.show_wallet_selection_dialog()
         
         self.update_displays()
+        
+        # Start pumping worker results back onto the Tk thread
+        self.root.after(50, self._drain_ui_queue)
+    
+    def _drain_ui_queue(self):
+        """Apply results posted by worker threads (runs on the Tk thread)"""
+        try:
+            while True:
+                message = self._ui_queue.get_nowait()
+                if message[0] == "tx_done":
+                    _, ok, tx = message
+                    self._on_tx_submitted(ok, tx)
+                elif message[0] == "call":
+                    message[1]()
+        except queue.Empty:
+            pass
+        except Exception as e:
+            print(f"❌ Error applying UI update: {e}")
+        
+        self.root.after(50, self._drain_ui_queue)
     
     def show_wallet_selection_dialog(self):
         """Show wallet selection dialog on startup"""
@@ -897,7 +973,7 @@ class GSCWalletGUI:
                 messagebox.showinfo("Success", f"Transaction sent successfully!\n\nTX ID: {tx.tx_id[:16]}...\nAmount: {tx.amount} GSC\nFee: {tx.fee} GSC\n\n✅ Added to mempool\n📱 Sent to Telegram\n📡 Broadcasted to network")
                 self.recipient_entry.delete(0, tk.END)
                 self.amount_entry.delete(0, tk.END)
-                self.update_displays()
+                self.update_displays({"balance", "mempool"})
             else:
                 print(f"❌ Failed to add transaction to mempool")
                 messagebox.showerror("Error", "Failed to add transaction to mempool")
@@ -1075,33 +1151,44 @@ class GSCWalletGUI:
         
         self.is_mining = False
     
-    def update_displays(self):
+    def update_displays(self, dirty=None):
+        """Refresh the given display sections (all of DISPLAY_SECTIONS when dirty is None)"""
+        if dirty is None:
+            dirty = DISPLAY_SECTIONS
+            self._displayed_version = getattr(self.blockchain, 'version', None)
+        
         # Update balance - Bitcoin Core format (get actual balance from blockchain)
-        if hasattr(self, 'current_address') and self.current_address:
-            balance = self.blockchain.get_balance(self.current_address)
-            self.balance_label.config(text=f"{balance:.8f} GSC")
-        else:
-            self.balance_label.config(text="No Wallet Loaded")
+        if "balance" in dirty:
+            if hasattr(self, 'current_address') and self.current_address:
+                balance = self.blockchain.get_balance(self.current_address)
+                self.balance_label.config(text=f"{balance:.8f} GSC")
+            else:
+                self.balance_label.config(text="No Wallet Loaded")
         
         # Update address display
-        if hasattr(self, 'address_display'):
+        if "address" in dirty and hasattr(self, 'address_display'):
             address_text = self.current_address[:20] + "..." if self.current_address else "No Wallet Loaded"
             self.address_display.config(text=address_text)
         
         # Update mempool
-        self.update_mempool_display()
+        if "mempool" in dirty:
+            self.update_mempool_display()
         
         # Update blockchain display
-        self.update_blockchain_display()
+        if "blockchain" in dirty:
+            self.update_blockchain_display()
         
         # Update transaction history
-        self.update_transaction_history()
+        if "history" in dirty:
+            self.update_transaction_history()
         
         # Update network info
-        self.update_network_info()
+        if "network" in dirty:
+            self.update_network_info()
         
         # Update supply displays (blockchain and network tabs)
-        self.update_supply_displays()
+        if "supply" in dirty:
+            self.update_supply_displays()
     
     def update_mempool_display(self):
         # Check if mempool_tree exists (only after mempool is unlocked)
@@ -2181,8 +2268,16 @@ Status: Active ✅"""
         self.root.mainloop()
     
     def update_loop(self):
-        # Update displays every 2 seconds
-        self.update_displays()
+        # Update displays every 2 seconds, skipping the redraw if the blockchain is unchanged;
+        # mining and peer changes don't bump the version, so they refresh the network section
+        version = getattr(self.blockchain, 'version', None)
+        peers = getattr(self.network_node, 'peers', None) or ()
+        network = (self.blockchain.is_mining, len(peers))
+        if version is None or version != self._displayed_version:
+            self.update_displays()
+        elif network != self._displayed_network:
+            self.update_displays({"network"})
+        self._displayed_network = network
         self.root.after(2000, self.update_loop)
     
     # ===== MENU COMMAND IMPLEMENTATIONS =====
@@ -2575,6 +2670,10 @@ Status: Active ✅"""
         def add_address():
             addr = simpledialog.askstring("Add Address", "Enter address:")
             if addr:
+                addr = addr.strip()
+                if not self.wallet_manager.verify_address(addr):
+                    messagebox.showerror("Invalid Address", "GSC addresses are 'GSC1' followed by 32 hex characters.")
+                    return
                 label = simpledialog.askstring("Add Address", "Enter label:")
                 if label:
                     self.wallet_manager.add_sending_address(addr, label)
@@ -2735,58 +2834,11 @@ Network:
             
             def build_thread():
                 try:
-                    import subprocess
-                    import os
-                    
-                    # Create build script
-                    build_script = '''
-import subprocess
-import sys
-import os
-
-def build_exe():
-    try:
-        # Install PyInstaller if not available
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
-        
-        # Build the executable
-        cmd = [
-            sys.executable, "-m", "PyInstaller",
-            "--onefile",
-            "--windowed",
-            "--name=GSC_Coin_Wallet",
-            "--add-data=blockchain.py;.",
-            "--add-data=wallet_manager.py;.",
-            "--add-data=paper_wallet_generator.py;.",
-            "gsc_wallet_gui.py"
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.returncode == 0, result.stderr
-        
-    except Exception as e:
-        return False, str(e)
-
-if __name__ == "__main__":
-    success, error = build_exe()
-    if success:
-        print("SUCCESS")
-    else:
-        print(f"ERROR: {error}")
-'''
-                    
-                    # Write and run build script
-                    with open('build_temp.py', 'w') as f:
-                        f.write(build_script)
                     # Run the fixed executable builder
                     result = subprocess.run([
                         sys.executable, "build_exe_fixed.py"
                     ], capture_output=True, text=True, cwd=os.getcwd())
                     
-                    # Clean up
-                    if os.path.exists('build_temp.py'):
-                        os.remove('build_temp.py')
-                    
                     def update_ui():
                         build_progress.stop()
                         if "SUCCESS" in result.stdout:
@@ -2808,10 +2860,7 @@ The executable is ready for distribution to other devices!"""
                             
                             # Ask if user wants to open the dist folder
                             if messagebox.askyesno("Open Folder", "Open the dist folder to see the files?"):
-                                try:
-                                    os.startfile("dist")
-                                except:
-                                    pass
+                                _open_folder("dist")
                         else:
                             build_status.config(text=" Build failed - Installing PyInstaller...")
                             # Try to install PyInstaller and show instructions
@@ -2839,42 +2888,39 @@ Then try building again. Or use the portable version instead."""
         ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
     
     def create_portable_version(self):
-        """Create portable version of the wallet"""
-        try:
-            import shutil
-            import os
-            
-            # Create portable folder
-            portable_dir = "GSC_Wallet_Portable"
-            if os.path.exists(portable_dir):
-                shutil.rmtree(portable_dir)
-            os.makedirs(portable_dir)
-            
-            # Copy essential files
-            files_to_copy = [
-                'gsc_wallet_gui.py',
-                'blockchain.py',
-                'wallet_manager.py',
-                'paper_wallet_generator.py',
-                'launch_gsc_coin.py',
-                'requirements.txt'
-            ]
-            
-            for file in files_to_copy:
-                if os.path.exists(file):
-                    shutil.copy2(file, portable_dir)
-            
-            # Create launcher batch file
-            launcher_content = '''@echo off
+        """Create portable version of the wallet (file copies run in a background thread)"""
+        portable_dir = "GSC_Wallet_Portable"
+        
+        def portable_thread():
+            try:
+                # Create portable folder (updated in place, only changed files are rewritten)
+                os.makedirs(portable_dir, exist_ok=True)
+                
+                # Copy essential files
+                files_to_copy = [
+                    'gsc_wallet_gui.py',
+                    'blockchain.py',
+                    'wallet_manager.py',
+                    'paper_wallet_generator.py',
+                    'launch_gsc_coin.py',
+                    'requirements.txt'
+                ]
+                existing_files = [f for f in files_to_copy if os.path.exists(f)]
+                
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    list(executor.map(lambda f: _copy_if_changed(f, portable_dir), existing_files))
+                
+                # Create launcher batch file
+                launcher_content = '''@echo off
 echo Starting GSC Coin Wallet...
 python launch_gsc_coin.py
 pause'''
-            
-            with open(os.path.join(portable_dir, 'Start_GSC_Wallet.bat'), 'w') as f:
-                f.write(launcher_content)
-            
-            # Create README
-            readme_content = '''GSC Coin Wallet - Portable Version
+                
+                with open(os.path.join(portable_dir, 'Start_GSC_Wallet.bat'), 'w') as f:
+                    f.write(launcher_content)
+                
+                # Create README
+                readme_content = '''GSC Coin Wallet - Portable Version
 ==================================
 
 Total Supply: 21.75 Trillion GSC
@@ -2896,21 +2942,23 @@ Features:
 - Mining with proof of work
 - Transaction processing
 '''
-            
-            with open(os.path.join(portable_dir, 'README.txt'), 'w') as f:
-                f.write(readme_content)
-            
+                
+                with open(os.path.join(portable_dir, 'README.txt'), 'w') as f:
+                    f.write(readme_content)
+                
+                self._ui_queue.put(("call", on_done))
+                
+            except Exception as error:
+                self._ui_queue.put(("call", lambda e=error: messagebox.showerror("Error", f"Failed to create portable version: {str(e)}")))
+        
+        def on_done():
             messagebox.showinfo("Success", f"Portable version created in '{portable_dir}' folder!")
             
             # Ask if user wants to open the folder
             if messagebox.askyesno("Open Folder", "Open the portable folder?"):
-                try:
-                    os.startfile(portable_dir)
-                except:
-                    pass
-                    
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create portable version: {str(e)}")
+                _open_folder(portable_dir)
+        
+        threading.Thread(target=portable_thread, daemon=True).start()
     
     def show_about(self):
         """Show about dialog"""
@@ -3003,8 +3051,12 @@ listwallets - List available wallets
                 self.console_output.insert(tk.END, "No wallet open\n")
         
         elif command == "getblockchaininfo":
-            info = self.blockchain.get_blockchain_info()
-            self.console_output.insert(tk.END, f"{json.dumps(info, indent=2)}\n")
+            # get_blockchain_info() re-validates the whole chain, so reuse the text until it changes
+            key = (getattr(self.blockchain, 'version', None), self.blockchain.is_mining)
+            if self._cached_info_json is None or self._cached_info_json[0] != key or key[0] is None:
+                info = self.blockchain.get_blockchain_info()
+                self._cached_info_json = (key, json.dumps(info, indent=2))
+            self.console_output.insert(tk.END, f"{self._cached_info_json[1]}\n")
         
         elif command == "listwallets":
             wallets = self.wallet_manager.list_wallets()
@@ -3063,36 +3115,53 @@ listwallets - List available wallets
             print(f"   Fee: {tx.fee} GSC")
             print(f"   TX ID: {tx.tx_id}")
             
-            if self.blockchain.add_transaction_to_mempool(tx):
-                print(f"✅ Transaction successfully added to mempool!")
-                
-                # Send transaction notification to Telegram
-                try:
-                    self.send_transaction_to_telegram(tx)
-                    print(f"📱 Transaction sent to Telegram bot")
-                except Exception as e:
-                    print(f"⚠️ Telegram notification failed: {e}")
-                
-                # Broadcast to network if available
-                if hasattr(self.blockchain, 'network_node') and self.blockchain.network_node:
-                    try:
-                        self.blockchain.network_node.broadcast_transaction(tx)
-                        print(f"📡 Transaction broadcasted to network")
-                    except Exception as e:
-                        print(f"⚠️ Network broadcast failed: {e}")
-                
-                messagebox.showinfo("Success", f"Transaction sent successfully!\n\nTX ID: {tx.tx_id[:16]}...\nAmount: {tx.amount} GSC\nFee: {tx.fee} GSC\n\n✅ Added to mempool\n📱 Sent to Telegram\n📡 Broadcasted to network")
-                self.clear_send_form()
-                self.update_displays()
-            else:
-                print(f"❌ Failed to add transaction to mempool")
-                messagebox.showerror("Error", "Failed to add transaction to mempool")
+            # Admit to mempool off the Tk thread; result comes back via _drain_ui_queue
+            threading.Thread(target=self._submit_tx, args=(tx,), daemon=True).start()
         
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numbers for amount and fee")
         except Exception as e:
             messagebox.showerror("Error", f"Transaction failed: {str(e)}")
     
+    def _submit_tx(self, tx):
+        """Add transaction to mempool and broadcast it (runs on a worker thread)"""
+        try:
+            ok = self.blockchain.add_transaction_to_mempool(tx)
+        except Exception as e:
+            print(f"❌ Error adding transaction to mempool: {e}")
+            ok = False
+        
+        if ok:
+            print(f"✅ Transaction successfully added to mempool!")
+            
+            # Send transaction notification to Telegram
+            try:
+                self.send_transaction_to_telegram(tx)
+                print(f"📱 Transaction sent to Telegram bot")
+            except Exception as e:
+                print(f"⚠️ Telegram notification failed: {e}")
+            
+            # Broadcast to network if available
+            if hasattr(self.blockchain, 'network_node') and self.blockchain.network_node:
+                try:
+                    self.blockchain.network_node.broadcast_transaction(tx)
+                    print(f"📡 Transaction broadcasted to network")
+                except Exception as e:
+                    print(f"⚠️ Network broadcast failed: {e}")
+        else:
+            print(f"❌ Failed to add transaction to mempool")
+        
+        self._ui_queue.put(("tx_done", ok, tx))
+    
+    def _on_tx_submitted(self, ok, tx):
+        """Report the outcome of a background transaction submission"""
+        if ok:
+            messagebox.showinfo("Success", f"Transaction sent successfully!\n\nTX ID: {tx.tx_id[:16]}...\nAmount: {tx.amount} GSC\nFee: {tx.fee} GSC\n\n✅ Added to mempool\n📱 Sent to Telegram\n📡 Broadcasted to network")
+            self.clear_send_form()
+            self.update_displays({"balance", "mempool"})
+        else:
+            messagebox.showerror("Error", "Failed to add transaction to mempool")
+    
     def clear_receive_form(self):
         """Clear receive form"""
         self.receive_label_entry.delete(0, tk.END)
@@ -3118,23 +3187,27 @@ listwallets - List available wallets
     
     def show_address_qr(self, address):
         """Show QR code for specific address"""
+        if not _HAS_QR:
+            messagebox.showinfo("Info", f"QR Code libraries not available.\nAddress: {address}")
+            return
+        
         try:
-            import qrcode
-            from PIL import Image, ImageTk
-            
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(address)
-            qr.make(fit=True)
-            
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
             # Show QR code in new window
             qr_window = tk.Toplevel(self.root)
             qr_window.title("Address QR Code")
             qr_window.geometry("350x400")
             
-            # Convert PIL image to PhotoImage
-            qr_photo = ImageTk.PhotoImage(qr_img)
+            # Reuse the PhotoImage if this address was shown before
+            qr_photo = self._qr_photo_cache.get(address)
+            if qr_photo is None:
+                qr = qrcode.QRCode(version=1, box_size=10, border=5)
+                qr.add_data(address)
+                qr.make(fit=True)
+                
+                qr_img = qr.make_image(fill_color="black", back_color="white")
+                qr_photo = ImageTk.PhotoImage(qr_img, master=self.root)
+                self._qr_photo_cache[address] = qr_photo
+            
             qr_label = ttk.Label(qr_window, image=qr_photo)
             qr_label.image = qr_photo  # Keep a reference
             qr_label.pack(pady=10)
@@ -3153,15 +3226,12 @@ listwallets - List available wallets
             ttk.Button(button_frame, text="Copy Address", command=copy_addr).pack(side=tk.LEFT, padx=5)
             ttk.Button(button_frame, text="Close", command=qr_window.destroy).pack(side=tk.LEFT, padx=5)
             
-        except ImportError:
-            messagebox.showinfo("Info", f"QR Code libraries not available.\nAddress: {address}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to show QR code: {str(e)}")
     
     def simple_download_exe(self):
         """Direct download like Bitcoin Core - no dependencies needed"""
         try:
-            import os
-            import shutil
-            
             # Check if pre-built .exe exists
             exe_path = "dist/GSC_Coin_Wallet.exe"
             
@@ -3193,10 +3263,7 @@ The .exe file is ready for immediate download!"""
                 
                 # Ask to open folder
                 if messagebox.askyesno("Open Download Folder", "Open the dist folder to access your downloadable .exe file?"):
-                    try:
-                        os.startfile("dist")
-                    except:
-                        pass
+                    _open_folder("dist")
             else:
                 # If .exe doesn't exist, show message that it needs to be built first
                 build_msg = """GSC Coin Wallet .exe not found.
@@ -3214,9 +3281,6 @@ The build process will take a few minutes but only needs to be done once."""
     def build_exe_for_download(self):
         """Build .exe for download distribution"""
         try:
-            import subprocess
-            import threading
-            
             def build_process():
                 try:
                     # Show progress dialog
@@ -3263,8 +3327,6 @@ The build process will take a few minutes but only needs to be done once."""
     def create_setup_installer(self):
         """Direct download Bitcoin Core-style setup.exe installer"""
         try:
-            import os
-            
             # Check if pre-built setup.exe exists
             setup_path = "dist/gsc-coin-2.0-win64-setup.exe"
             
@@ -3292,10 +3354,7 @@ Users can download and run this setup.exe on any Windows device - just like Bitc
                 
                 # Ask to open folder
                 if messagebox.askyesno("Open Download Folder", "Open the dist folder to access your setup.exe?"):
-                    try:
-                        os.startfile("dist")
-                    except:
-                        pass
+                    _open_folder("dist")
             else:
                 # If setup.exe doesn't exist, offer to create it
                 build_msg = """Bitcoin Core-style setup.exe not found.
@@ -3313,9 +3372,6 @@ Users will be able to download and install GSC Coin just like they install Bitco
     def build_setup_for_download(self):
         """Build setup.exe for download distribution"""
         try:
-            import subprocess
-            import threading
-            
             def build_process():
                 try:
                     # Show progress dialog
@@ -3499,7 +3555,7 @@ Users will be able to download and install GSC Coin just like they install Bitco
             try:
                 new_addr = self.wallet_manager.generate_new_address(label)
                 messagebox.showinfo("Success", f"New address generated:\n{new_addr}")
-                self.update_displays()
+                self.update_displays({"address"})
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to generate address: {str(e)}")
     
@@ -7,49 +7,88 @@ Optimized for easy deployment and node connectivity
 import sys
 import os
 import time
+import random
+import asyncio
+import socket
 import threading
+import hashlib
+import importlib.util
 from pathlib import Path
 
 # Add current directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-def check_and_install_dependencies():
-    """Check and install required dependencies silently"""
+def _p(msg, ascii_msg=None):
+    """Print msg, or its ASCII form when the console encoding (e.g. cp1252) cannot show it"""
+    encoding = sys.stdout.encoding or 'ascii'
+    try:
+        msg.encode(encoding)
+    except UnicodeEncodeError:
+        msg = ascii_msg if ascii_msg is not None else msg.encode(encoding, 'replace').decode(encoding)
+    print(msg)
+
+def check_and_install_dependencies(cache_dir=None, data_dir=None):
+    """Check and install required dependencies silently (wheels cached in cache_dir)"""
+    # A frozen build bundles its dependencies, and pip can't run there (sys.executable is the exe)
+    if getattr(sys, 'frozen', False):
+        return True
+    
     required_packages = {
         'cryptography': 'cryptography>=3.4.8',
         'PIL': 'Pillow>=8.3.2',
         'qrcode': 'qrcode>=7.3.1',
         'matplotlib': 'matplotlib',
-        'numpy': 'numpy'
+        'numpy': 'numpy',
+        'orjson': 'orjson'
     }
     
+    # Skip the whole check if a previous run already provisioned this package list
+    deps_key = hashlib.sha1(repr((sys.executable, sorted(required_packages.items()))).encode()).hexdigest()
+    marker_file = os.path.join(data_dir, 'deps.ok') if data_dir else None
+    if marker_file and os.path.exists(marker_file):
+        try:
+            with open(marker_file, 'r') as f:
+                if f.read().strip() == deps_key:
+                    return True
+        except OSError:
+            pass
+    
     missing_packages = []
     
+    # find_spec only locates the package, it does not import (execute) it;
+    # anything already in sys.modules is skipped with a plain dict lookup
     for package_name, pip_name in required_packages.items():
-        try:
-            if package_name == 'cryptography':
-                import cryptography
-            elif package_name == 'PIL':
-                from PIL import Image
-            elif package_name == 'qrcode':
-                import qrcode
-            elif package_name == 'matplotlib':
-                import matplotlib
-            elif package_name == 'numpy':
-                import numpy
-        except ImportError:
+        if package_name not in sys.modules and importlib.util.find_spec(package_name) is None:
             missing_packages.append(pip_name.split('>=')[0])
     
     if missing_packages:
         print("Installing required packages...")
         import subprocess
-        for package in missing_packages:
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package], 
-                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            except subprocess.CalledProcessError:
-                print(f"Warning: Could not install {package}")
+        pip_cmd = [sys.executable, "-m", "pip", "install", "--prefer-binary"]
+        if cache_dir:
+            pip_cmd += ["--cache-dir", cache_dir]
+        pip_env = dict(os.environ, PIP_DISABLE_PIP_VERSION_CHECK="1")
+        try:
+            # One pip run resolves and downloads everything in a single pass
+            subprocess.check_call(pip_cmd + missing_packages, env=pip_env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except subprocess.CalledProcessError:
+            # Fall back to one package at a time so a single bad package doesn't block the rest
+            for package in missing_packages:
+                try:
+                    subprocess.check_call(pip_cmd + [package], env=pip_env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                except subprocess.CalledProcessError:
+                    print(f"Warning: Could not install {package}")
+                    marker_file = None
+    
+    if marker_file:
+        try:
+            with open(marker_file, 'w') as f:
+                f.write(deps_key)
+        except OSError:
+            pass
     
     return True
 
@@ -63,11 +102,43 @@ def setup_data_directory():
         app_dir = current_dir
     
     data_dir = os.path.join(app_dir, 'gsc_data')
-    os.makedirs(data_dir, exist_ok=True)
+    
+    # Persistent pip wheel cache so reinstalls (e.g. portable/USB deployments) reuse downloads
+    cache_dir = os.path.join(data_dir, 'pip-cache')
+    
+    # pip-cache is the deepest directory, so one makedirs creates both on first run
+    try:
+        os.makedirs(cache_dir)
+    except FileExistsError:
+        pass
     
     # Set blockchain data file path
     blockchain_file = os.path.join(data_dir, 'gsc_blockchain.json')
-    return data_dir, blockchain_file
+    return data_dir, blockchain_file, cache_dir
+
+def port_is_free(port):
+    """True if port can currently be bound"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        probe.bind(('0.0.0.0', port))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+def start_on_free_port(network_node, candidates):
+    """Start network_node's server on the first candidate port it can bind; returns the port, or None"""
+    for port in candidates:
+        # The probe skips ports that are plainly taken; if another process grabs the port
+        # before the server binds it, start_server fails and the next candidate is tried
+        if not port_is_free(port):
+            continue
+        network_node.port = port
+        if network_node.start_server():
+            return port
+    return None
 
 def connect_to_known_nodes(network_node):
     """Connect to known GSC nodes for synchronization"""
@@ -78,14 +149,32 @@ def connect_to_known_nodes(network_node):
         ('127.0.0.1', 8335)
     ]
     
+    async def try_one(host, port):
+        # Cheap non-blocking reachability probe before the blocking handshake
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=0.5)
+            writer.close()
+        except (OSError, asyncio.TimeoutError):
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, network_node.connect_to_peer, host, port, 0.5)
+        except Exception:
+            return False
+    
+    async def bootstrap():
+        await asyncio.sleep(2)  # Wait for our server to start
+        pending = list(known_nodes)
+        # Dial all nodes at once; retry the unreachable ones with exponential backoff
+        for attempt in range(4):
+            results = await asyncio.gather(*(try_one(host, port) for host, port in pending))
+            pending = [node for node, ok in zip(pending, results) if not ok]
+            if not pending:
+                break
+            await asyncio.sleep(min(30.0, 0.25 * 2 ** attempt) + random.uniform(0, 0.25))
+    
     def try_connect():
-        time.sleep(2)  # Wait for our server to start
-        for host, port in known_nodes:
-            try:
-                network_node.connect_to_peer(host, port)
-                time.sleep(1)
-            except:
-                continue
+        asyncio.run(bootstrap())
     
     # Start connection attempts in background
     connect_thread = threading.Thread(target=try_connect)
@@ -95,53 +184,53 @@ def connect_to_known_nodes(network_node):
 def main():
     """Main application entry point"""
     print("=" * 60)
-    print("🪙 GSC COIN WALLET - STANDALONE VERSION 🪙")
+    _p("🪙 GSC COIN WALLET - STANDALONE VERSION 🪙", "=== GSC COIN WALLET - STANDALONE VERSION ===")
     print("=" * 60)
-    print("✅ Easy deployment - no installation required")
-    print("✅ Automatic node discovery and synchronization")
-    print("✅ Complete blockchain wallet functionality")
-    print("✅ Mining and transaction capabilities")
+    _p("✅ Easy deployment - no installation required", "[+] Easy deployment - no installation required")
+    _p("✅ Automatic node discovery and synchronization", "[+] Automatic node discovery and synchronization")
+    _p("✅ Complete blockchain wallet functionality", "[+] Complete blockchain wallet functionality")
+    _p("✅ Mining and transaction capabilities", "[+] Mining and transaction capabilities")
     print()
     
     try:
-        # Check dependencies
-        check_and_install_dependencies()
-        
         # Setup data directory
-        data_dir, blockchain_file = setup_data_directory()
+        data_dir, blockchain_file, cache_dir = setup_data_directory()
         print(f"Data directory: {data_dir}")
         
-        # Import modules after dependency check
+        # Check dependencies
+        check_and_install_dependencies(cache_dir, data_dir)
+        
+        # Warm up the GUI stack (tkinter/PIL/qrcode) while the chain loads and the node starts.
+        # This is the import the launch actually waits on; matplotlib is only a listed
+        # dependency (no module imports it), so pre-loading pyplot would be wasted work
+        threading.Thread(target=lambda: __import__('gsc_wallet_gui'), daemon=True).start()
+        
+        # Import modules after dependency check (each one only when it is first needed)
         from blockchain import GSCBlockchain
-        from network import GSCNetworkNode
-        from gsc_wallet_gui import GSCWalletGUI
         
         # Initialize blockchain with custom data path
         blockchain = GSCBlockchain()
         blockchain.data_file = blockchain_file
         
-        # Try to load existing blockchain
-        if os.path.exists(blockchain_file):
-            try:
-                blockchain.load_from_file(blockchain_file)
-                print("✅ Existing blockchain loaded")
-            except:
-                print("⚠ Creating new blockchain")
-        
-        # Initialize network with fallback ports
-        network_node = None
-        for port in [8333, 8334, 8335, 8336]:
-            try:
-                network_node = GSCNetworkNode(blockchain, port=port)
-                if network_node.start_server():
-                    print(f"✅ P2P node started on port {port}")
-                    break
-            except:
-                continue
+        # Try to load existing blockchain, else a bundled binary (msgpack) initial state
+        binary_file = os.path.splitext(blockchain_file)[0] + '.msgpack'
+        if not os.path.exists(blockchain_file) and os.path.exists(binary_file):
+            if blockchain.load_blockchain(binary_file):
+                _p("✅ Initial blockchain loaded", "[OK] Initial blockchain loaded")
+        elif os.path.exists(blockchain_file):
+            if blockchain.load_blockchain(blockchain_file):
+                _p("✅ Existing blockchain loaded", "[OK] Existing blockchain loaded")
+            else:
+                _p("⚠ Creating new blockchain", "!! Creating new blockchain")
         
-        if not network_node:
-            print("⚠ Running in offline mode")
-            network_node = GSCNetworkNode(blockchain, port=8333)
+        # Initialize network on the first free fallback port
+        from network import GSCNetworkNode
+        network_node = GSCNetworkNode(blockchain, port=8333)
+        port = start_on_free_port(network_node, [8333, 8334, 8335, 8336])
+        if port:
+            _p(f"✅ P2P node started on port {port}", f"[OK] P2P node started on port {port}")
+        else:
+            _p("⚠ Running in offline mode", "!! Running in offline mode")
         
         # Connect blockchain and network
         blockchain.set_network_node(network_node)
@@ -151,7 +240,8 @@ def main():
             connect_to_known_nodes(network_node)
         
         # Launch GUI wallet
-        print("🚀 Launching GSC Coin Wallet...")
+        _p("🚀 Launching GSC Coin Wallet...", ">>> Launching GSC Coin Wallet...")
+        from gsc_wallet_gui import GSCWalletGUI  # Tk/PIL/qrcode stack
         wallet = GSCWalletGUI(blockchain, network_node)
         
         # Set data directory for wallet
@@ -161,11 +251,11 @@ def main():
         wallet.run()
         
     except ImportError as e:
-        print(f"❌ Missing required modules: {e}")
+        _p(f"❌ Missing required modules: {e}", f"[X] Missing required modules: {e}")
         print("Please ensure all GSC Coin files are in the same directory")
         input("Press Enter to exit...")
     except Exception as e:
-        print(f"❌ Error starting GSC Coin: {e}")
+        _p(f"❌ Error starting GSC Coin: {e}", f"[X] Error starting GSC Coin: {e}")
         input("Press Enter to exit...")
 
 if __name__ == "__main__":
@@ -9,10 +9,15 @@ import sys
 import os
 import subprocess
 import importlib.util
+import hashlib
 import time
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
+    # A frozen build bundles its dependencies, and pip can't run there (sys.executable is the exe)
+    if getattr(sys, 'frozen', False):
+        return True
+    
     required_packages = {
         'tkinter': 'tkinter',
         'cryptography': 'cryptography',
@@ -22,23 +27,24 @@ def check_dependencies():
         'numpy': 'numpy'
     }
     
+    # Skip the whole check if a previous run already provisioned this package list
+    deps_key = hashlib.sha1(repr((sys.executable, sorted(required_packages.items()))).encode()).hexdigest()
+    # Next to the exe when frozen: __file__ is then inside the onefile temp dir, deleted on exit
+    app_dir = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__))
+    marker_file = os.path.join(app_dir, 'gsc_data', 'deps.ok')
+    try:
+        with open(marker_file, 'r') as f:
+            if f.read().strip() == deps_key:
+                return True
+    except OSError:
+        pass
+    
     missing_packages = []
     
+    # find_spec only locates the package, it does not import (execute) it;
+    # anything already in sys.modules is skipped with a plain dict lookup
     for package_name, pip_name in required_packages.items():
-        try:
-            if package_name == 'tkinter':
-                import tkinter
-            elif package_name == 'cryptography':
-                import cryptography
-            elif package_name == 'PIL':
-                from PIL import Image
-            elif package_name == 'qrcode':
-                import qrcode
-            elif package_name == 'matplotlib':
-                import matplotlib
-            elif package_name == 'numpy':
-                import numpy
-        except ImportError:
+        if package_name not in sys.modules and importlib.util.find_spec(package_name) is None:
             missing_packages.append(pip_name)
     
     if missing_packages:
@@ -47,16 +53,92 @@ def check_dependencies():
             print(f"  - {package}")
         print("\nInstalling missing packages...")
         
-        for package in missing_packages:
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"[OK] {package} installed successfully")
-            except subprocess.CalledProcessError:
-                print(f"[X] Failed to install {package}")
-                return False
+        pip_cmd = [sys.executable, "-m", "pip", "install", "--prefer-binary"]
+        pip_env = dict(os.environ, PIP_DISABLE_PIP_VERSION_CHECK="1")
+        try:
+            # One pip run resolves and downloads everything in a single pass
+            subprocess.check_call(pip_cmd + missing_packages, env=pip_env)
+            print(f"[OK] {', '.join(missing_packages)} installed successfully")
+        except subprocess.CalledProcessError:
+            # Retry one at a time to report which package failed
+            for package in missing_packages:
+                try:
+                    subprocess.check_call(pip_cmd + [package], env=pip_env)
+                    print(f"[OK] {package} installed successfully")
+                except subprocess.CalledProcessError:
+                    print(f"[X] Failed to install {package}")
+                    return False
+    
+    try:
+        os.makedirs(os.path.dirname(marker_file), exist_ok=True)
+        with open(marker_file, 'w') as f:
+            f.write(deps_key)
+    except OSError:
+        pass
     
     return True
 
+def bundled_data_version(base_path):
+    """Version of the data bundled into the exe (deployment.ver, else the bundled chain's size and mtime)"""
+    try:
+        with open(os.path.join(base_path, "deployment.ver"), 'r') as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    
+    # A stat is enough to notice a different bundle; hashing the chain would read it all on every launch
+    try:
+        st = os.stat(os.path.join(base_path, "gsc_blockchain.json"))
+    except OSError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def deploy_bundled_data(base_path, app_path):
+    """Copy the bundled blockchain/wallets next to the exe once per bundled data version"""
+    import shutil
+    
+    version = bundled_data_version(base_path)
+    marker_file = os.path.join(app_path, "deployment.ver")
+    try:
+        with open(marker_file, 'r') as f:
+            if version and f.read().strip() == version:
+                return
+    except OSError:
+        pass
+    
+    # One directory listing each instead of a stat per path
+    existing = {entry.name for entry in os.scandir(app_path)}
+    bundled = {entry.name for entry in os.scandir(base_path)}
+    
+    # Deploy blockchain file if missing
+    if "gsc_blockchain.json" not in existing:
+        bundled_chain = os.path.join(base_path, "gsc_blockchain.json")
+        if "gsc_blockchain.json" in bundled:
+            try:
+                with open(bundled_chain, 'rb') as src, open(os.path.join(app_path, "gsc_blockchain.json"), 'wb') as dst:
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+                print("[+] Deployed initial blockchain state")
+            except Exception as e:
+                print(f"[!] Error deploying blockchain: {e}")
+    
+    # Deploy wallets if missing
+    wallets_dir = os.path.join(app_path, "wallets")
+    if "wallets" not in existing:
+        bundled_wallets = os.path.join(base_path, "wallets")
+        if "wallets" in bundled:
+            try:
+                shutil.copytree(bundled_wallets, wallets_dir)
+                print("[+] Deployed initial wallets")
+            except Exception as e:
+                print(f"[!] Error deploying wallets: {e}")
+    
+    if version:
+        try:
+            with open(marker_file, 'w') as f:
+                f.write(version)
+        except OSError:
+            pass
+
 def main():
     """Main launcher function"""
     print("=" * 60)
@@ -84,42 +166,17 @@ def main():
 
     # DATA DEPLOYMENT FOR EXE
     if getattr(sys, 'frozen', False):
-        import shutil
-        base_path = sys._MEIPASS
-        app_path = os.path.dirname(sys.executable)
-        
-        # Deploy blockchain file if missing
-        if not os.path.exists(os.path.join(app_path, "gsc_blockchain.json")):
-            bundled_chain = os.path.join(base_path, "gsc_blockchain.json")
-            if os.path.exists(bundled_chain):
-                try:
-                    shutil.copy2(bundled_chain, os.path.join(app_path, "gsc_blockchain.json"))
-                    print("[+] Deployed initial blockchain state")
-                except Exception as e:
-                    print(f"[!] Error deploying blockchain: {e}")
-        
-        # Deploy wallets if missing
-        wallets_dir = os.path.join(app_path, "wallets")
-        if not os.path.exists(wallets_dir):
-            bundled_wallets = os.path.join(base_path, "wallets")
-            if os.path.exists(bundled_wallets):
-                try:
-                    shutil.copytree(bundled_wallets, wallets_dir)
-                    print("[+] Deployed initial wallets")
-                except Exception as e:
-                    print(f"[!] Error deploying wallets: {e}")
+        deploy_bundled_data(sys._MEIPASS, os.path.dirname(sys.executable))
     
     try:
         # Initialize blockchain
         print("Initializing GSC Coin blockchain...")
         from blockchain import GSCBlockchain
-        from network import GSCNetworkNode
-        from gsc_wallet_gui import GSCWalletGUI
-        
         blockchain = GSCBlockchain()
         
         # Initialize P2P network node
         print("Starting P2P network node...")
+        from network import GSCNetworkNode
         network_node = GSCNetworkNode(blockchain, port=8333)
         
         # Connect blockchain and network
@@ -133,6 +190,7 @@ def main():
         
         # Launch GUI wallet
         print(">>> Launching GSC Coin Wallet GUI...")
+        from gsc_wallet_gui import GSCWalletGUI  # Tk/PIL/qrcode stack
         wallet = GSCWalletGUI(blockchain, network_node)
         wallet.run()
         
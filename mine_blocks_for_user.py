@@ -6,7 +6,8 @@ Mines blocks and sends rewards to specified wallet address
 import sys
 import os
 import time
-from blockchain import GSCBlockchain, Transaction
+import heapq
+from blockchain import GSCBlockchain, Transaction, Block
 
 def mine_blocks_for_user():
     """Mine first 5 blocks for user wallet"""
@@ -27,28 +28,29 @@ def mine_blocks_for_user():
     print(f"Starting mining process...")
     print()
     
-    # Create some dummy transactions to mine
+    # Create some dummy transactions to mine (one shared timestamp for the batch)
+    now = time.time()
     dummy_transactions = [
         Transaction(
             sender="GSC_FOUNDATION_RESERVE",
             receiver=user_address,
             amount=100.0,
             fee=1.0,
-            timestamp=time.time()
+            timestamp=now
         ),
         Transaction(
             sender="GSC_FOUNDATION_RESERVE", 
             receiver="GSC1TestAddress1",
             amount=50.0,
             fee=0.5,
-            timestamp=time.time()
+            timestamp=now
         ),
         Transaction(
             sender="GSC_FOUNDATION_RESERVE",
             receiver="GSC1TestAddress2", 
             amount=25.0,
             fee=0.25,
-            timestamp=time.time()
+            timestamp=now
         )
     ]
     
@@ -60,59 +62,73 @@ def mine_blocks_for_user():
     print(f"\nMempool size: {len(blockchain.mempool)} transactions")
     print()
     
+    # Chain tip and difficulty are carried across the loop instead of re-read per block
+    latest_block = blockchain.get_latest_block()
+    difficulty = blockchain.difficulty
+    
+    # Get current reward (Bitcoin-like halving); a 5-block run never crosses a halving boundary
+    current_reward = blockchain.get_current_reward()
+    
+    # Per-block output is collected and written to the console in one go
+    out = []
+    emit = out.append
+    
+    def flush_output():
+        sys.stdout.write(''.join(out))
+        sys.stdout.flush()
+        out.clear()
+    
     # Mine 5 blocks
     for block_num in range(1, 6):
-        print(f"🔨 Mining Block {block_num}/5...")
-        print(f"Miner Address: {user_address}")
+        emit(f"🔨 Mining Block {block_num}/5...\n")
+        emit(f"Miner Address: {user_address}\n")
         
-        # Create new block
-        latest_block = blockchain.get_latest_block()
-        
-        # Get current reward (Bitcoin-like halving)
-        current_reward = blockchain.get_current_reward()
-        
-        # Select transactions from mempool (up to 3 per block)
-        selected_transactions = blockchain.mempool[:3].copy() if blockchain.mempool else []
+        # Select the highest-fee transactions from mempool (up to 3 per block, no duplicates)
+        unique_transactions = {tx.tx_id: tx for tx in blockchain.mempool}.values()
+        selected_transactions = heapq.nlargest(3, unique_transactions, key=lambda tx: tx.fee)
         
         # Create block
-        from blockchain import Block
         new_block = Block(
             index=latest_block.index + 1,
             timestamp=time.time(),
             transactions=selected_transactions,
             previous_hash=latest_block.hash,
-            difficulty=blockchain.difficulty,
+            difficulty=difficulty,
             reward=current_reward
         )
         
         # Mine the block
-        print(f"Mining with difficulty {blockchain.difficulty}...")
+        emit(f"Mining with difficulty {difficulty}...\n")
+        flush_output()
         start_time = time.time()
         
-        mining_stats = new_block.mine_block(blockchain.difficulty, user_address)
+        mining_stats = new_block.mine_block(difficulty, user_address)
         
         mining_time = time.time() - start_time
         
         # Add block to chain
         if blockchain.add_block(new_block):
-            # Remove mined transactions from mempool
-            for tx in selected_transactions:
-                if tx in blockchain.mempool:
-                    blockchain.mempool.remove(tx)
+            latest_block = new_block
+            
+            # Remove mined transactions from mempool in a single pass
+            mined_ids = {tx.tx_id for tx in selected_transactions}
+            blockchain.mempool[:] = [tx for tx in blockchain.mempool if tx.tx_id not in mined_ids]
             
-            print(f"✅ Block {new_block.index} mined successfully!")
-            print(f"   Hash: {new_block.hash}")
-            print(f"   Nonce: {new_block.nonce:,}")
-            print(f"   Mining Time: {mining_time:.2f} seconds")
-            print(f"   Reward: {current_reward} GSC")
-            print(f"   Transactions: {len(new_block.transactions)}")
+            emit(f"✅ Block {new_block.index} mined successfully!\n")
+            emit(f"   Hash: {new_block.hash}\n")
+            emit(f"   Nonce: {new_block.nonce:,}\n")
+            emit(f"   Mining Time: {mining_time:.2f} seconds\n")
+            emit(f"   Reward: {current_reward} GSC\n")
+            emit(f"   Transactions: {len(new_block.transactions)}\n")
             
             # Update blockchain height for reward calculation
             blockchain.block_height = new_block.index
             
-            print()
+            emit("\n")
+            flush_output()
         else:
-            print(f"❌ Failed to add block {block_num} to chain")
+            emit(f"❌ Failed to add block {block_num} to chain\n")
+            flush_output()
             break
     
     # Show final results
@@ -125,11 +141,13 @@ def mine_blocks_for_user():
     print(f"Total blocks mined: {len(blockchain.chain) - 1}")  # Exclude genesis
     print(f"Blockchain height: {len(blockchain.chain) - 1}")
     
-    # Show all balances
-    print("\n📊 All Address Balances:")
-    for address, balance in blockchain.balances.items():
-        if balance > 0:
-            print(f"   {address}: {balance:.8f} GSC")
+    # Show the largest positive balances, highest first
+    positive_balances = [(address, balance) for address, balance in blockchain.balances.items() if balance > 0]
+    top_balances = heapq.nlargest(50, positive_balances, key=lambda item: item[1])
+    print(f"\n📊 Top {len(top_balances)} Address Balances:")
+    print('\n'.join(f"   {address}: {balance:.8f} GSC" for address, balance in top_balances))
+    if len(positive_balances) > len(top_balances):
+        print(f"   ... and {len(positive_balances) - len(top_balances)} more addresses")
     
     # Save blockchain
     try:
@@ -3,13 +3,144 @@ GSC Coin P2P Network Module
 Handles peer-to-peer networking, node discovery, and blockchain synchronization
 """
 
+import os
+import sys
+import math
+import errno
+import functools
 import socket
 import threading
 import json
 import time
+import struct
+import queue
 import hashlib
-from datetime import datetime
-import pickle
+import secrets
+import selectors
+import atexit
+import logging
+import logging.handlers
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Message-handler logging: network threads only enqueue records and one listener thread
+# writes them out, so handlers never block on the console (set GSC_NET_DEBUG=1 for per-message logs)
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG if os.environ.get('GSC_NET_DEBUG') else logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Optional fast JSON codec for peer messages (stdlib json is the fallback)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj) -> bytes:
+    """Serialize a message to JSON bytes"""
+    if orjson:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. sets or ints beyond 64 bits
+    return json.dumps(obj).encode()
+
+def _loads(data):
+    """Parse JSON from bytes, bytearray or memoryview"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(str(data, 'utf-8'))
+
+# Optional binary codec for bulk chain transfer (falls back to one JSON message)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_HEX_BLOCK_FIELDS = ('hash', 'previous_hash', 'merkle_root')
+
+def _pack_block(block) -> bytes:
+    """msgpack-encode a block for streaming, with hex hashes sent as raw bytes"""
+    block_data = {
+        'index': block.index,
+        'timestamp': block.timestamp,
+        'transactions': [tx.to_dict() for tx in block.transactions],
+        'nonce': block.nonce,
+        'difficulty': block.difficulty,
+        'miner': block.miner,
+        'reward': block.reward
+    }
+    for field in _HEX_BLOCK_FIELDS:
+        value = getattr(block, field)
+        try:
+            block_data[field] = bytes.fromhex(value)
+        except (TypeError, ValueError):
+            block_data[field] = value
+    return msgpack.packb(block_data, use_bin_type=True)
+
+def _unpack_block(data) -> dict:
+    """Inverse of _pack_block, giving the same dict as the JSON transfer"""
+    block_data = msgpack.unpackb(data, raw=False)
+    if block_data is not None:
+        for field in _HEX_BLOCK_FIELDS:
+            value = block_data.get(field)
+            if isinstance(value, bytes):
+                block_data[field] = value.hex()
+    return block_data
+
+def _decode_chain_frame(view):
+    """Decode a full-chain reply frame as (is_json, data): one of the msgpack block frames, or
+    the single JSON frame a server without msgpack answers with (it starts with '{', which a
+    packed block never does)"""
+    if view[:1] == b'{':
+        return True, _loads(view)
+    return False, _unpack_block(view)
+
+# Event loop marker for the wakeup socket
+_WAKEUP = object()
+
+# Optional compression for full-chain transfer; compressed frames are told apart by the zstd magic
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def _compress(data: bytes) -> bytes:
+    """zstd-compress a frame payload, keeping the original if compression doesn't shrink it"""
+    compressed = zstd.ZstdCompressor(level=3).compress(data)
+    return compressed if len(compressed) < len(data) else data
+
+def _decompressing(decode):
+    """Wrap a frame decoder so zstd-compressed payloads are inflated first. A payload that
+    would inflate past MAX_MESSAGE_SIZE, or fails to decompress, raises ConnectionError so
+    the peer is dropped"""
+    def decode_frame(view):
+        if zstd and view[:4] == _ZSTD_MAGIC:
+            try:
+                # The declared content size is what decompress() allocates, so check it first;
+                # max_output_size bounds frames that don't declare one
+                if zstd.frame_content_size(view) > MAX_MESSAGE_SIZE:
+                    raise ConnectionError("Compressed message too large")
+                view = zstd.ZstdDecompressor().decompress(view, max_output_size=MAX_MESSAGE_SIZE)
+            except zstd.ZstdError as e:
+                raise ConnectionError(f"Bad compressed message: {e}")
+        return decode(view)
+    return decode_frame
+
+# Compression schemes we accept on peer connections (advertised in the handshake)
+_COMPRESSION = ['zstd'] if zstd else []
+
+# Replies at least this large are zstd-compressed for peers that accept it
+COMPRESS_MIN_SIZE = 4096
+
+# End-of-stream marker for msgpack chain transfer (a packed nil)
+_END_OF_STREAM = b'\xc0'
 
 # Default seed nodes for one-click join (Production vs Testnet)
 SEED_NODES = [
@@ -29,16 +160,352 @@ LOCAL_NETWORK_RANGES = [
     "172.16.0.",       # Private networks
 ]
 
+# Wire framing: every message is a 4-byte big-endian length followed by the JSON payload,
+# so several messages can share one persistent connection
+_FRAME_HEADER = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+class BufferPool:
+    """Reusable bytearray receive buffers, so each message doesn't allocate fresh bytes"""
+    def __init__(self, size, count):
+        self.size = size
+        self.count = count
+        self._q = queue.LifoQueue()
+        for _ in range(count):
+            self._q.put(bytearray(size))
+    
+    def acquire(self, size=0):
+        """Get a buffer of at least size bytes (oversized requests get a one-off buffer)"""
+        if size > self.size:
+            return bytearray(size)
+        try:
+            return self._q.get_nowait()
+        except queue.Empty:
+            return bytearray(self.size)
+    
+    def release(self, buf):
+        if len(buf) == self.size and self._q.qsize() < self.count:
+            self._q.put(buf)
+
+_recv_buffers = BufferPool(64 * 1024, 16)
+
+def _recv_exact_into(sock, view):
+    """Fill view completely from sock (raises ConnectionError on EOF)"""
+    while view:
+        n = sock.recv_into(view)
+        if not n:
+            raise ConnectionError("Connection closed mid-message")
+        view = view[n:]
+
+def frame(data: bytes) -> bytes:
+    """Length-prefix a message (build once when the same message goes to many peers)"""
+    return _FRAME_HEADER.pack(len(data)) + data
+
+# Buffers per sendmsg call (stays under the usual IOV_MAX of 1024)
+_MAX_IOV = 512
+
+# Linux: tell the kernel more data follows so stream batches coalesce into full segments
+_MSG_MORE = getattr(socket, 'MSG_MORE', 0)
+
+def sendall_vectored(sock, buffers, flags=0):
+    """sendall for a list of buffers: one gathered sendmsg per batch instead of a send
+    (or a concatenating copy) per buffer; joins them where sendmsg isn't available"""
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(b''.join(buffers))
+        return
+    pending = [memoryview(buf) for buf in buffers if buf]
+    while pending:
+        sent = sock.sendmsg(pending[:_MAX_IOV], (), flags)
+        # Skip the fully sent buffers, then trim a partially sent one
+        while pending and sent >= len(pending[0]):
+            sent -= len(pending[0])
+            pending.pop(0)
+        if sent:
+            pending[0] = pending[0][sent:]
+
+def send_frame(sock, data: bytes):
+    """Send one length-prefixed message"""
+    sendall_vectored(sock, [_FRAME_HEADER.pack(len(data)), data])
+
+def recv_message(sock, decode=_loads):
+    """Receive and decode one length-prefixed (JSON by default) message.
+    Returns (message, size), or (None, 0) if the peer closed the connection."""
+    header = bytearray(_FRAME_HEADER.size)
+    n = sock.recv_into(header)
+    if not n:
+        return None, 0
+    _recv_exact_into(sock, memoryview(header)[n:])
+    (size,) = _FRAME_HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ConnectionError(f"Message too large ({size} bytes)")
+    
+    buf = _recv_buffers.acquire(size)
+    try:
+        view = memoryview(buf)[:size]
+        _recv_exact_into(sock, view)
+        return decode(view), size
+    finally:
+        view.release()
+        _recv_buffers.release(buf)
+
+# Accept threads (one SO_REUSEPORT listener each) on Linux; elsewhere a single listener
+ACCEPT_WORKERS = 4
+
+# Open peer connections beyond which new inbound peers are turned away (Bitcoin Core's default)
+MAX_PEER_CONNECTIONS = 125
+
+# Announced transaction bodies kept for answering getdata
+MAX_RELAY_TRANSACTIONS = 10_000
+
+# Seconds a getdata for a transaction stays in flight; other peers' inv for the same id
+# is not answered with another getdata until then
+TX_REQUEST_TIMEOUT = 30
+
+# Consecutive send failures before a peer is dropped; between failures it is skipped for
+# an exponentially growing delay (seconds, capped)
+PEER_FAILURE_LIMIT = 5
+PEER_RETRY_MAX_DELAY = 300
+
+# Most transactions returned per mempool/getmempool page
+MAX_MEMPOOL_PAGE = 500
+
+# Encoded getdata block responses kept for repeat requests (LRU)
+MAX_CACHED_BLOCK_RESPONSES = 256
+
+# Cap on messages served per wakeup so one busy peer can't hold a worker indefinitely
+MAX_MESSAGES_PER_WAKEUP = 32
+
+def _tune_socket(sock):
+    """Disable Nagle (small control messages go out at once) and enable keepalive on a peer socket"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_peer(peer_address: str):
+    """'host:port' -> (host, int port), parsed once per distinct peer address"""
+    host, port = peer_address.rsplit(':', 1)
+    return host, int(port)
+
+_CONNECT_PENDING = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+def probe_peers(candidates, timeout=1.0):
+    """Start a non-blocking connect to every (host, port) at once and return those that
+    accepted within timeout (total time is about one timeout, not one per candidate)"""
+    sel = selectors.DefaultSelector()
+    reachable = []
+    try:
+        for host, port in candidates:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                if sock.connect_ex((host, port)) in _CONNECT_PENDING:
+                    sel.register(sock, selectors.EVENT_WRITE, (host, port))
+                    continue
+            except OSError:
+                pass
+            sock.close()
+        
+        deadline = time.monotonic() + timeout
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                sel.unregister(key.fileobj)
+                # Writable means the connect finished; SO_ERROR says whether it succeeded
+                if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    reachable.append(key.data)
+                key.fileobj.close()
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+    return reachable
+
+class PeerSet(set):
+    """Set of peer addresses that keeps a sorted snapshot until its membership changes"""
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._sorted = None
+    
+    def add(self, addr):
+        if addr not in self:
+            super().add(addr)
+            self._sorted = None
+    
+    def discard(self, addr):
+        if addr in self:
+            super().discard(addr)
+            self._sorted = None
+    
+    def remove(self, addr):
+        super().remove(addr)
+        self._sorted = None
+    
+    def clear(self):
+        super().clear()
+        self._sorted = None
+    
+    def sorted(self) -> tuple:
+        """Peers in sorted order (a shared, immutable snapshot)"""
+        snapshot = self._sorted
+        if snapshot is None:
+            snapshot = self._sorted = tuple(sorted(self))
+        return snapshot
+
+class RollingBloomFilter:
+    """Approximate set of recently seen ids in fixed memory: two Bloom filter generations,
+    the older one dropped once the current one holds `capacity` ids"""
+    def __init__(self, capacity=100_000, error_rate=1e-4):
+        self.capacity = capacity
+        self.num_bits = int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._current = bytearray((self.num_bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+        self._lock = threading.Lock()
+    
+    def _positions(self, key: str):
+        # Double hashing: k bit positions from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def _contains(self, positions):
+        return any(all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+                   for bits in (self._current, self._previous))
+    
+    def __contains__(self, key: str):
+        return self._contains(self._positions(key))
+    
+    def add(self, key: str) -> bool:
+        """Add key; True if it was (probably) seen already"""
+        positions = self._positions(key)
+        with self._lock:
+            if self._contains(positions):
+                return True
+            if self._count >= self.capacity:
+                self._previous, self._current = self._current, bytearray(len(self._current))
+                self._count = 0
+            for p in positions:
+                self._current[p >> 3] |= 1 << (p & 7)
+            self._count += 1
+            return False
+
+class FrameReader:
+    """Incremental length-prefixed frame parser for a peer socket. Each read takes only what
+    has already arrived, so a peer that stalls mid-frame leaves a partial frame buffered
+    instead of holding a worker in a blocking recv."""
+    READ_SIZE = 64 * 1024
+    MAX_READ_SIZE = 4 * 1024 * 1024
+    
+    def __init__(self):
+        self._buf = bytearray()
+    
+    def read_from(self, sock) -> int:
+        """One recv from a socket the selector reported readable (so it returns at once);
+        returns the bytes read, 0 if the peer closed the connection"""
+        # Ask for the rest of a large frame in one go, within reason
+        wanted = self.READ_SIZE
+        if len(self._buf) >= _FRAME_HEADER.size:
+            (size,) = _FRAME_HEADER.unpack_from(self._buf)
+            wanted = min(max(wanted, _FRAME_HEADER.size + size - len(self._buf)), self.MAX_READ_SIZE)
+        data = sock.recv(wanted)
+        self._buf += data
+        return len(data)
+    
+    def next_frame(self):
+        """Remove and return the next complete payload, or None until one has fully arrived"""
+        if len(self._buf) < _FRAME_HEADER.size:
+            return None
+        (size,) = _FRAME_HEADER.unpack_from(self._buf)
+        if size > MAX_MESSAGE_SIZE:
+            raise ConnectionError(f"Message too large ({size} bytes)")
+        end = _FRAME_HEADER.size + size
+        if len(self._buf) < end:
+            return None
+        payload = bytes(memoryview(self._buf)[_FRAME_HEADER.size:end])
+        del self._buf[:end]
+        return payload
+
+class PeerConnection:
+    """Persistent socket to a peer; the lock keeps concurrent frames from interleaving.
+    Frames queued while another thread is writing go out together in its next sendmsg."""
+    def __init__(self, sock):
+        self.sock = sock
+        self.lock = threading.Lock()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+    
+    def send(self, data: bytes):
+        self._write(_FRAME_HEADER.pack(len(data)), data)
+    
+    def send_framed(self, framed: bytes):
+        """Send a message that already carries its length prefix (see frame())"""
+        self._write(framed)
+    
+    def send_stream(self, frames) -> int:
+        """Send an iterable of framed messages back to back, with nothing interleaved;
+        frames are produced while earlier ones are on the wire. Returns bytes sent."""
+        sent = 0
+        with self.lock:
+            batch = []
+            for framed in frames:
+                batch.append(framed)
+                if len(batch) >= _MAX_IOV:
+                    # More frames follow, so let the kernel hold back a partial segment
+                    sendall_vectored(self.sock, batch, _MSG_MORE)
+                    sent += sum(map(len, batch))
+                    batch = []
+            # The final write goes out without MSG_MORE so the tail isn't delayed
+            sendall_vectored(self.sock, batch)
+            sent += sum(map(len, batch))
+        return sent
+    
+    def _write(self, *buffers):
+        with self._pending_lock:
+            self._pending.extend(buffers)
+        with self.lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            # Empty if an earlier writer already flushed our frame with its own
+            if batch:
+                sendall_vectored(self.sock, batch)
+
 class GSCNetworkNode:
     def __init__(self, blockchain, port=8333):
         self.blockchain = blockchain
         self.port = port
-        self.peers = set()
+        self.peers = PeerSet()
         self.server_socket = None
+        self._listen_sockets = []
         self.running = False
         self.node_id = self.generate_node_id()
         self.known_nodes = set()
         self.sync_lock = threading.Lock()
+        
+        # Persistent connections by peer address (read via the event loop below)
+        self._peer_conns = {}
+        self._peer_conns_lock = threading.Lock()
+        
+        # One selector thread watches every peer socket; a peer with a message waiting
+        # is handed to a small worker pool instead of each peer owning a blocked thread
+        self._selector = selectors.DefaultSelector()
+        self._peer_workers = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4),
+                                                thread_name_prefix='gsc-peer')
+        self._watch_queue = queue.SimpleQueue()
+        
+        # Partially received frames per watched peer socket: {socket: FrameReader}
+        self._peer_readers = {}
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        
+        # Broadcast fan-out runs in parallel, so a slow or dead peer doesn't delay the rest
+        self._broadcast_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix='gsc-broadcast')
 
         # Basic traffic counters (for GUI + production monitoring)
         self._traffic_lock = threading.Lock()
@@ -48,33 +515,71 @@ class GSCNetworkNode:
         self._messages_received = 0
         self._last_message_time = None
         
+        # Recently seen transaction ids, so relayed duplicates are dropped before any work
+        self._tx_seen = RollingBloomFilter()
+        
+        # Transactions we sent getdata for, oldest first: {tx_id: monotonic expiry}
+        self._tx_requested = OrderedDict()
+        self._tx_requested_lock = threading.Lock()
+        
+        # Bodies of transactions we announced via inv, served on getdata: {tx_id: tx dict}
+        self._tx_relay = OrderedDict()
+        
+        # Encoded getdata block responses, most recently used last: {block hash: bytes}
+        self._block_responses = OrderedDict()
+        self._block_responses_lock = threading.Lock()
+        
+        # Serialized full-chain sync payloads: {(fmt, compressed): ((height, tip_hash), payload)}
+        self._chain_cache = {}
+        
+        # Detected on first use; the address rarely changes within a session (see refresh_local_ip)
+        self._local_ip = None
+        
         # Bitcoin-style sync state
         self.sync_mode = "live"  # headers -> blocks -> mempool -> live
         self.syncing_with = set()  # Peers we're syncing with
+        self._sync_status_cache = None  # (inputs key, get_sync_status result)
+        
+        # Peers whose handshake said they accept zstd-compressed frames
+        self._zstd_peers = set()
+        
+        # Send failures per peer: {peer address: (consecutive failures, retry not before)}
+        self._peer_failures = {}
+        self._peer_failures_lock = threading.Lock()
         self.requested_headers = set()
         self.requested_blocks = set()
         self.sync_complete = True
         
     def generate_node_id(self):
-        """Generate unique node ID"""
-        return hashlib.sha256(f"{socket.gethostname()}{time.time()}".encode()).hexdigest()[:16]
+        """Generate unique node ID (an opaque random identifier, not a commitment to anything)"""
+        # 8 random bytes: the same 16 hex chars as before, unique without hashing host and time
+        return secrets.token_hex(8)
+    
+    def _chain_tip(self):
+        """(height, tip hash) taken from a single read of the tip block, so the pair is consistent
+        even if a block is appended concurrently"""
+        tip = self.blockchain.chain[-1]
+        return tip.index + 1, tip.hash
     
     def start_server(self):
         """Start P2P server to accept incoming connections"""
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.bind(('0.0.0.0', self.port))
-            self.server_socket.listen(10)
+            self._listen_sockets = self._open_listeners()
+            self.server_socket = self._listen_sockets[0]
             self.running = True
             
             print(f"GSC Node started on port {self.port}")
             print(f"Node ID: {self.node_id}")
             
-            # Start server thread
-            server_thread = threading.Thread(target=self.accept_connections)
-            server_thread.daemon = True
-            server_thread.start()
+            # Start the peer event loop, then one accept thread per listening socket
+            loop_thread = threading.Thread(target=self._run_event_loop)
+            loop_thread.daemon = True
+            loop_thread.start()
+            
+            for listen_socket in self._listen_sockets:
+                server_thread = threading.Thread(target=self.accept_connections, args=(listen_socket,))
+                server_thread.daemon = True
+                server_thread.start()
             
             # Start peer discovery
             discovery_thread = threading.Thread(target=self.discover_peers)
@@ -86,43 +591,105 @@ class GSCNetworkNode:
             print(f"Failed to start P2P server: {e}")
             return False
     
-    def accept_connections(self):
+    def _open_listeners(self):
+        """Listening sockets for self.port; several SO_REUSEPORT ones on Linux so the kernel
+        spreads incoming connections across the accept threads"""
+        count = min(ACCEPT_WORKERS, os.cpu_count() or 1)
+        if not (sys.platform.startswith('linux') and hasattr(socket, 'SO_REUSEPORT')):
+            count = 1
+        
+        if count > 1:
+            # A plain bind first, so a port held by another node still fails instead of being shared
+            probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                probe.bind(('0.0.0.0', self.port))
+            finally:
+                probe.close()
+        
+        listeners = []
+        try:
+            for _ in range(count):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                listeners.append(sock)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                if count > 1:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                sock.bind(('0.0.0.0', self.port))
+                sock.listen(10)
+        except OSError:
+            for sock in listeners:
+                sock.close()
+            raise
+        return listeners
+    
+    def accept_connections(self, server_socket=None):
         """Accept incoming peer connections"""
+        server_socket = server_socket or self.server_socket
         while self.running:
             try:
-                client_socket, address = self.server_socket.accept()
-                print(f"New peer connected: {address}")
+                client_socket, address = server_socket.accept()
                 
-                # Handle peer in separate thread
-                peer_thread = threading.Thread(
-                    target=self.handle_peer, 
-                    args=(client_socket, address)
-                )
-                peer_thread.daemon = True
-                peer_thread.start()
+                # Backpressure: refuse rather than grow without bound when saturated
+                with self._peer_conns_lock:
+                    saturated = len(self._peer_conns) >= MAX_PEER_CONNECTIONS
+                if saturated:
+                    print(f"Peer limit reached, refusing {address}")
+                    client_socket.close()
+                    continue
                 
+                print(f"New peer connected: {address}")
+                self.handle_peer(client_socket, address)
             except Exception as e:
                 if self.running:
                     print(f"Error accepting connection: {e}")
     
-    def request_mempool_from_peer(self, peer_address: str) -> list:
+    def _run_event_loop(self):
+        """Event loop: dispatch readable peer sockets to the workers"""
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ, _WAKEUP)
+        while self.running:
+            try:
+                events = self._selector.select(timeout=1.0)
+            except (OSError, ValueError):
+                break
+            
+            for key, _ in events:
+                try:
+                    if key.data is _WAKEUP:
+                        self._wakeup_recv.recv(4096)
+                    else:
+                        # Not watched while a worker reads it, so one peer's messages stay in order
+                        self._selector.unregister(key.fileobj)
+                        self._peer_workers.submit(self._service_peer, key.fileobj, key.data)
+                except Exception as e:
+                    if self.running:
+                        print(f"Error in network event loop: {e}")
+            
+            # (Re)start watching sockets queued by other threads
+            while True:
+                try:
+                    sock, peer_address = self._watch_queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self._selector.register(sock, selectors.EVENT_READ, peer_address)
+                except (KeyError, ValueError, OSError):
+                    pass  # Already watched, or closed in the meantime
+    
+    def request_mempool_from_peer(self, peer_address: str, timeout=10) -> list:
         """Request mempool transactions from a specific peer (Bitcoin-like)"""
         try:
-            host, port = peer_address.split(':')
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(10)
-                sock.connect((host, int(port)))
+            with self._open_request_socket(peer_address, timeout) as sock:
                 
                 request = {
                     'type': 'request_mempool',
                     'node_id': self.node_id
                 }
                 
-                sock.send(json.dumps(request).encode())
-                response = sock.recv(8192).decode()
+                send_frame(sock, _dumps(request))
+                data, _ = recv_message(sock)
                 
-                if response:
-                    data = json.loads(response)
+                if data:
                     return data.get('mempool', [])
                     
         except Exception as e:
@@ -132,21 +699,18 @@ class GSCNetworkNode:
     def request_blockchain_info(self, peer_address: str) -> dict:
         """Request blockchain info from peer (Bitcoin-like)"""
         try:
-            host, port = peer_address.split(':')
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(10)
-                sock.connect((host, int(port)))
+            with self._open_request_socket(peer_address, 10) as sock:
                 
                 request = {
                     'type': 'request_blockchain_info',
                     'node_id': self.node_id
                 }
                 
-                sock.send(json.dumps(request).encode())
-                response = sock.recv(4096).decode()
+                send_frame(sock, _dumps(request))
+                response, _ = recv_message(sock)
                 
                 if response:
-                    return json.loads(response)
+                    return response
                     
         except Exception as e:
             print(f"Error requesting blockchain info from {peer_address}: {e}")
@@ -155,66 +719,137 @@ class GSCNetworkNode:
     def request_full_blockchain(self, peer_address: str) -> list:
         """Request full blockchain from peer (Bitcoin-like)"""
         try:
-            host, port = peer_address.split(':')
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(30)  # Longer timeout for full blockchain
-                sock.connect((host, int(port)))
-                
-                request = {
-                    'type': 'request_full_blockchain',
-                    'node_id': self.node_id
-                }
-                
-                sock.send(json.dumps(request).encode())
-                
-                # Receive large blockchain data
-                full_data = b''
-                while True:
-                    chunk = sock.recv(8192)
-                    if not chunk:
-                        break
-                    full_data += chunk
-                    if b'"end_of_blockchain"' in full_data:
-                        break
-                
-                if full_data:
-                    data = json.loads(full_data.decode())
-                    return data.get('blockchain', [])
-                    
+            return list(self.iter_full_blockchain(peer_address))
         except Exception as e:
             print(f"Error requesting blockchain from {peer_address}: {e}")
         return []
     
+    def iter_full_blockchain(self, peer_address: str):
+        """Yield a peer's blocks (as dicts) while they are still arriving, so callers can
+        deserialize and check each one as the rest of the chain downloads; raises on failure"""
+        with self._open_request_socket(peer_address, 30) as sock:
+            
+            request = {
+                'type': 'request_full_blockchain',
+                'node_id': self.node_id
+            }
+            if msgpack:
+                request['format'] = 'msgpack'
+            if zstd:
+                request['compression'] = 'zstd'
+            
+            send_frame(sock, _dumps(request))
+            
+            if msgpack:
+                # One msgpack frame per block until the end-of-stream frame, unless the server
+                # fell back to sending the whole chain as JSON
+                decode_frame = _decompressing(_decode_chain_frame)
+                while True:
+                    reply, size = recv_message(sock, decode_frame)
+                    if not size:
+                        raise ConnectionError("Connection closed mid-blockchain")
+                    is_json, block_data = reply
+                    if is_json:
+                        yield from block_data.get('blockchain', [])
+                        return
+                    if block_data is None:
+                        return
+                    yield block_data
+            
+            # Receive large blockchain data
+            data, _ = recv_message(sock, _decompressing(_loads))
+            
+            if data:
+                yield from data.get('blockchain', [])
+    
     def handle_peer(self, client_socket, address):
-        """Handle communication with a peer"""
+        """Handle communication with a peer (its messages are served from the event loop)"""
         peer_address = f"{address[0]}:{address[1]}"
+        _tune_socket(client_socket)
         self.peers.add(peer_address)
-        
+        self._register_peer_conn(peer_address, client_socket)
+        self._watch_peer(client_socket, peer_address)
+    
+    def _watch_peer(self, client_socket, peer_address):
+        """Queue a peer socket for the event loop to watch"""
+        self._watch_queue.put((client_socket, peer_address))
         try:
-            while self.running:
-                data = client_socket.recv(4096)
-                if not data:
-                    break
-
-                with self._traffic_lock:
-                    self._bytes_received += len(data)
-                    self._messages_received += 1
-                    self._last_message_time = time.time()
-                
-                try:
-                    message = json.loads(data.decode())
-                    response = self.process_message(message, client_socket)
-                    if response:
-                        client_socket.send(json.dumps(response).encode())
-                except Exception as e:
-                    print(f"Error processing message from {peer_address}: {e}")
-        
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            pass
+    
+    def _service_peer(self, client_socket, peer_address):
+        """Read what has arrived on a readable peer, answer its complete messages, then watch it again"""
+        reader = self._peer_readers.get(client_socket)
+        if reader is None:
+            reader = self._peer_readers[client_socket] = FrameReader()
+        try:
+            received = reader.read_from(client_socket)
         except Exception as e:
             print(f"Error handling peer {peer_address}: {e}")
-        finally:
-            self.peers.discard(peer_address)
-            client_socket.close()
-            print(f"Peer disconnected: {peer_address}")
+            received = 0
+        
+        if not received or not self.running:
+            self._disconnect_peer(client_socket, peer_address)
+            return
+        self._serve_frames(client_socket, peer_address, reader)
+    
+    def _serve_frames(self, client_socket, peer_address, reader):
+        """Answer the complete messages buffered for a peer"""
+        decode = _decompressing(_loads)
+        for _ in range(MAX_MESSAGES_PER_WAKEUP):
+            try:
+                payload = reader.next_frame()
+                if payload is None:
+                    break
+                message = decode(payload)
+            except ValueError as e:
+                # Malformed JSON: the frame was consumed, so the stream is still in sync
+                print(f"Error processing message from {peer_address}: {e}")
+                continue
+            except Exception as e:
+                print(f"Error handling peer {peer_address}: {e}")
+                self._disconnect_peer(client_socket, peer_address)
+                return
+            
+            with self._traffic_lock:
+                self._bytes_received += len(payload)
+                self._messages_received += 1
+                self._last_message_time = time.time()
+            
+            try:
+                response = self.process_message(message, client_socket)
+                if response:
+                    # Handlers may return an already encoded (bytes) payload
+                    if not isinstance(response, bytes):
+                        response = _dumps(response)
+                    if len(response) >= COMPRESS_MIN_SIZE and peer_address in self._zstd_peers:
+                        response = _compress(response)
+                    self._register_peer_conn(peer_address, client_socket).send(response)
+            except Exception as e:
+                print(f"Error processing message from {peer_address}: {e}")
+            
+            if not self.running:
+                self._disconnect_peer(client_socket, peer_address)
+                return
+        else:
+            # Hit the per-wakeup cap: the socket may not become readable again, so serve
+            # the frames still buffered from a fresh task (letting other peers run first)
+            try:
+                self._peer_workers.submit(self._serve_frames, client_socket, peer_address, reader)
+                return
+            except RuntimeError:
+                pass  # Worker pool shut down
+        
+        self._watch_peer(client_socket, peer_address)
+    
+    def _disconnect_peer(self, client_socket, peer_address):
+        """Forget and close a peer socket the event loop was serving"""
+        self._peer_readers.pop(client_socket, None)
+        self.peers.discard(peer_address)
+        self._drop_peer_conn(peer_address, client_socket)
+        client_socket.close()
+        print(f"Peer disconnected: {peer_address}")
     
     def process_message(self, message, client_socket):
         """Process incoming message from peer"""
@@ -228,15 +863,18 @@ class GSCNetworkNode:
             peer_hash = message.get('best_hash')
             
             print(f"Received handshake from {peer_node_id} (height: {peer_height})")
+            self._note_peer_compression(client_socket.getpeername(), message)
             
             # Send handshake acknowledgment
+            height, best_hash = self._chain_tip()
             return {
                 'type': 'handshake_ack',
                 'node_id': self.node_id,
                 'version': '1.0',
-                'blockchain_height': len(self.blockchain.chain),
-                'best_hash': self.blockchain.get_latest_block().hash,
-                'status': 'connected'
+                'blockchain_height': height,
+                'best_hash': best_hash,
+                'status': 'connected',
+                'compression': _COMPRESSION
             }
         
         # Bitcoin-style sync messages
@@ -247,12 +885,12 @@ class GSCNetworkNode:
         elif msg_type == 'getblocks':
             return self._handle_getblocks(message, client_socket)
         elif msg_type == 'inv':
-            self._handle_inv(message, client_socket)
+            return self._handle_inv(message, client_socket)
         elif msg_type == 'getdata':
             return self._handle_getdata(message, client_socket)
         elif msg_type == 'block':
             self._handle_block(message, client_socket)
-        elif msg_type == 'mempool':
+        elif msg_type in ('mempool', 'getmempool'):
             return self._handle_mempool_request(message, client_socket)
         elif msg_type == 'tx':
             self._handle_transaction_batch(message, client_socket)
@@ -261,14 +899,16 @@ class GSCNetworkNode:
             # Handle new block announcement
             block_data = message.get('block')
             if block_data:
-                print(f"Received new block: {block_data.get('hash', 'unknown')[:16]}...")
+                logger.debug("Received new block: %s...", block_data.get('hash', 'unknown')[:16])
                 # TODO: Validate and add block to chain
         
         elif msg_type == 'new_transaction':
             # Handle new transaction announcement and propagate
             tx_data = message.get('transaction')
+            if tx_data and tx_data.get('tx_id') and self._tx_seen.add(tx_data['tx_id']):
+                return None  # Already seen (relayed back to us or via another peer)
             if tx_data:
-                print(f"📡 Received new transaction: {tx_data.get('tx_id', 'unknown')[:16]}...")
+                logger.debug("📡 Received new transaction: %s...", tx_data.get('tx_id', 'unknown')[:16])
                 try:
                     # Reconstruct transaction from data
                     from blockchain import Transaction
@@ -284,14 +924,14 @@ class GSCNetworkNode:
                     
                     # Add to mempool if valid and not duplicate
                     if self.blockchain.add_transaction_to_mempool(tx):
-                        print(f"✅ Transaction added to mempool: {tx.tx_id[:16]}...")
+                        logger.debug("✅ Transaction added to mempool: %s...", tx.tx_id[:16])
                         # Propagate to other peers (avoid loops)
                         sender_peer = f"{client_socket.getpeername()[0]}:{client_socket.getpeername()[1]}"
                         self.propagate_transaction_to_peers(tx, exclude_peer=sender_peer)
                     else:
-                        print(f"❌ Transaction rejected or duplicate: {tx.tx_id[:16]}...")
+                        logger.debug("❌ Transaction rejected or duplicate: %s...", tx.tx_id[:16])
                 except Exception as e:
-                    print(f"Error processing received transaction: {e}")
+                    logger.warning("Error processing received transaction: %s", e)
         
         elif msg_type == 'ping':
             # Respond to ping
@@ -308,37 +948,23 @@ class GSCNetworkNode:
         
         elif msg_type == 'request_blockchain_info':
             # Send blockchain info
+            height, best_hash = self._chain_tip()
             return {
                 'type': 'blockchain_info_response',
-                'height': len(self.blockchain.chain),
-                'best_hash': self.blockchain.get_latest_block().hash,
+                'height': height,
+                'best_hash': best_hash,
                 'difficulty': self.blockchain.difficulty,
                 'total_supply': self.blockchain.current_supply
             }
         
         elif msg_type == 'request_full_blockchain':
-            # Send full blockchain (for sync)
-            blockchain_data = []
-            for block in self.blockchain.chain:
-                block_data = {
-                    'index': block.index,
-                    'timestamp': block.timestamp,
-                    'transactions': [tx.to_dict() for tx in block.transactions],
-                    'previous_hash': block.previous_hash,
-                    'hash': block.hash,
-                    'merkle_root': block.merkle_root,
-                    'nonce': block.nonce,
-                    'difficulty': block.difficulty,
-                    'miner': block.miner,
-                    'reward': block.reward
-                }
-                blockchain_data.append(block_data)
-            
-            return {
-                'type': 'blockchain_response',
-                'blockchain': blockchain_data,
-                'end_of_blockchain': True
-            }
+            compressed = bool(zstd) and message.get('compression') == 'zstd'
+            if message.get('format') == 'msgpack' and msgpack:
+                self._stream_blockchain(client_socket, compressed)
+            else:
+                # Send full blockchain (for sync), serialized once per chain tip
+                self._conn_for_socket(client_socket).send(self._chain_payload('json', compressed))
+            return None
         
         elif msg_type == 'peer_list':
             # Handle peer list update
@@ -357,7 +983,7 @@ class GSCNetworkNode:
         # Respond with version if we haven't sent it yet (inbound connection)
         # For simplicity, we always send verack to acknowledge
         verack_msg = {'type': 'verack'}
-        client_socket.send(json.dumps(verack_msg).encode())
+        self._send_framed(client_socket, verack_msg)
         
         # If inbound, we also need to send our version
         # (This is a simplification of the full state machine)
@@ -365,11 +991,11 @@ class GSCNetworkNode:
             'type': 'version',
             'version': 1,
             'node_id': self.node_id,
-            'current_height': len(self.blockchain.chain),
-            'timestamp': datetime.now().isoformat()
+            'current_height': self._chain_tip()[0],
+            'timestamp': time.time()
         }
         # In a real implementation we track if we already sent version
-        client_socket.send(json.dumps(my_version).encode())
+        self._send_framed(client_socket, my_version)
 
     def handle_verack(self, client_socket):
         """Handle verack message"""
@@ -385,47 +1011,46 @@ class GSCNetworkNode:
             'locator_hash': latest_hash,
             'stop_hash': '0'*64 
         }
-        client_socket.send(json.dumps(msg).encode())
+        self._send_framed(client_socket, msg)
     
-    def connect_to_peer(self, host, port):
+    def connect_to_peer(self, host, port, connect_timeout=15):
         """Connect to a peer node with improved handshake"""
         try:
             print(f"Attempting to connect to {host}:{port}...")
             peer_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            peer_socket.settimeout(15)  # Increased timeout
+            peer_socket.settimeout(connect_timeout)
             peer_socket.connect((host, port))
+            _tune_socket(peer_socket)
             print(f"Socket connected to {host}:{port}")
             
             # Send handshake
+            height, best_hash = self._chain_tip()
             handshake = {
                 'type': 'handshake',
                 'node_id': self.node_id,
                 'version': '1.0',
-                'blockchain_height': len(self.blockchain.chain),
-                'best_hash': self.blockchain.get_latest_block().hash
+                'blockchain_height': height,
+                'best_hash': best_hash,
+                'compression': _COMPRESSION
             }
-            handshake_data = json.dumps(handshake).encode()
-            peer_socket.send(handshake_data)
+            handshake_data = _dumps(handshake)
+            send_frame(peer_socket, handshake_data)
             print(f"Handshake sent to {host}:{port}")
             
             # Wait for handshake response
             peer_socket.settimeout(10)  # Timeout for response
-            response = peer_socket.recv(1024).decode()
-            print(f"Received response from {host}:{port}: {response[:100]}...")
+            peer_info, _ = recv_message(peer_socket)
+            print(f"Received response from {host}:{port}: {str(peer_info)[:100]}...")
             
-            if response:
-                peer_info = json.loads(response)
+            if peer_info:
                 if peer_info.get('type') == 'handshake_ack':
                     peer_address = f"{host}:{port}"
                     self.peers.add(peer_address)
+                    self._note_peer_compression((host, port), peer_info)
                     
-                    # Handle peer in separate thread
-                    peer_thread = threading.Thread(
-                        target=self.handle_peer,
-                        args=(peer_socket, (host, port))
-                    )
-                    peer_thread.daemon = True
-                    peer_thread.start()
+                    # Connection stays open for later broadcasts; the event loop reads it
+                    peer_socket.settimeout(None)
+                    self.handle_peer(peer_socket, (host, port))
                     
                     print(f"✅ Successfully connected to peer: {peer_address} (height: {peer_info.get('blockchain_height', 0)})")
                     return True
@@ -441,31 +1066,6 @@ class GSCNetworkNode:
         except socket.timeout:
             print(f"❌ Connection timeout to {host}:{port}")
             return False
-<<<<<<< Updated upstream
-    
-    def discover_peers(self):
-        """Discover and connect to other GSC nodes"""
-        # Enhanced peer discovery with better connectivity
-        potential_peers = [
-            ('127.0.0.1', 8334),
-            ('127.0.0.1', 8335),
-            ('127.0.0.1', 8336),
-            ('localhost', 8334),
-            ('localhost', 8335)
-        ]
-        
-        while self.running:
-            for host, port in potential_peers:
-                peer_addr = f"{host}:{port}"
-                if peer_addr not in self.peers and port != self.port:
-                    try:
-                        self.connect_to_peer(host, port)
-                        time.sleep(1)  # Small delay between connections
-                    except:
-                        pass
-            
-            time.sleep(15)  # Check for new peers more frequently
-=======
         except ConnectionRefusedError:
             print(f"❌ Connection refused by {host}:{port} - Make sure the other device is running GSC Coin")
             return False
@@ -554,9 +1154,19 @@ class GSCNetworkNode:
         
         while self.running and discovery_attempts < max_attempts:
             try:
+                # Probe seed and known nodes all at once; only reachable ones get a handshake
+                candidates = [(seed_node, 8333) for seed_node in SEED_NODES if seed_node not in self.peers]
+                for node in list(self.known_nodes):
+                    if node not in self.peers and not self._peer_backing_off(node):
+                        try:
+                            candidates.append(_split_peer(node))
+                        except ValueError:
+                            pass
+                reachable = set(probe_peers(candidates))
+                
                 # Try to connect to seed nodes
                 for seed_node in SEED_NODES:
-                    if seed_node not in self.peers:
+                    if seed_node not in self.peers and (seed_node, 8333) in reachable:
                         try:
                             self.connect_to_peer(seed_node, 8333)
                             if len(self.peers) > 0:
@@ -568,8 +1178,10 @@ class GSCNetworkNode:
                 for node in list(self.known_nodes):
                     if node not in self.peers and len(self.peers) < 8:
                         try:
-                            host, port = node.split(':')
-                            self.connect_to_peer(host, int(port))
+                            host, port = _split_peer(node)
+                            if (host, port) not in reachable:
+                                continue
+                            self.connect_to_peer(host, port)
                             print(f"Connected to known node: {node}")
                         except Exception as e:
                             pass
@@ -596,21 +1208,17 @@ class GSCNetworkNode:
     def request_peer_list(self, peer_address: str):
         """Request peer list from a connected peer"""
         try:
-            host, port = peer_address.split(':')
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(5)
-                sock.connect((host, int(port)))
+            with self._open_request_socket(peer_address, 5) as sock:
                 
                 request = {
                     'type': 'request_peers',
                     'node_id': self.node_id
                 }
                 
-                sock.send(json.dumps(request).encode())
-                response = sock.recv(4096).decode()
+                send_frame(sock, _dumps(request))
+                data, _ = recv_message(sock)
                 
-                if response:
-                    data = json.loads(response)
+                if data:
                     peers = data.get('peers', [])
                     for peer in peers:
                         if peer not in self.peers and peer != f"127.0.0.1:{self.port}":
@@ -620,16 +1228,10 @@ class GSCNetworkNode:
         except Exception as e:
             pass  # Silently fail
 
->>>>>>> Stashed changes
     def try_connect_peer(self, ip, port):
         """Try to connect to a potential peer"""
         try:
-            test_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            test_socket.settimeout(1)
-            result = test_socket.connect_ex((ip, port))
-            test_socket.close()
-            
-            if result == 0:  # Connection successful
+            if probe_peers([(ip, port)]):  # Connection successful
                 peer_address = f"{ip}:{port}"
                 if peer_address not in self.peers:
                     self.connect_to_peer(ip, port)
@@ -639,72 +1241,73 @@ class GSCNetworkNode:
     
     def broadcast_block(self, block, exclude_peer=None):
         """Broadcast new block to all peers"""
-        message = {
-            'type': 'new_block',
-            'block': self.serialize_block(block),
-            'sender': self.node_id,
-            'timestamp': datetime.now().isoformat()
-        }
+        # The envelope is spliced around the block's memoized JSON (its frame minus the
+        # length prefix) instead of building and re-encoding a message dict
+        block_json = memoryview(self._block_frame(block))[_FRAME_HEADER.size:]
+        message = b''.join((b'{"type":"new_block","block":', block_json,
+                            b',"sender":', _dumps(self.node_id),
+                            b',"timestamp":', repr(time.time()).encode(), b'}'))
         
-        self.broadcast_message(message, exclude_peer)
+        self._fan_out(frame(message), exclude_peer)
     
-    def broadcast_transaction(self, transaction):
-        """Broadcast transaction to all connected peers with automatic propagation"""
-        message = {
-            'type': 'new_transaction',
-            'transaction': transaction.to_dict(),
-            'node_id': self.node_id,
-            'timestamp': time.time()
+    def _announce_transaction(self, transaction) -> dict:
+        """Keep a transaction's body for getdata and build the inv that announces it"""
+        self._tx_relay[transaction.tx_id] = transaction.to_dict()
+        while len(self._tx_relay) > MAX_RELAY_TRANSACTIONS:
+            self._tx_relay.popitem(last=False)
+        return {
+            'type': 'inv',
+            'txs': [transaction.tx_id],
+            'node_id': self.node_id
         }
+    
+    def broadcast_transaction(self, transaction):
+        """Broadcast transaction to all connected peers with automatic propagation
+        (peers get an inv with the id and fetch the body with getdata if they lack it)"""
+        message = self._announce_transaction(transaction)
         
         broadcast_count = 0
         failed_peers = []
         
+        # Our own transaction coming back through the mesh is a duplicate too
+        self._tx_seen.add(transaction.tx_id)
+        
         print(f"🚀 Broadcasting transaction {transaction.tx_id[:16]}... to {len(self.peers)} peers")
         
+        # Encoded and framed once, then the same bytes go to every peer
+        framed = frame(_dumps(message))
         for peer in list(self.peers):
+            if self._peer_backing_off(peer):
+                continue
             try:
-                host, port = peer.split(':')
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(3)
-                sock.connect((host, int(port)))
-                sock.send(json.dumps(message).encode())
-                sock.close()
+                self._send_to_peer(peer, framed, connect_timeout=3)
+                self._note_send_success(peer)
                 broadcast_count += 1
                 print(f"✅ Transaction sent to {peer}")
             except Exception as e:
                 failed_peers.append(peer)
                 print(f"❌ Failed to send to {peer}: {str(e)[:50]}...")
         
-        # Remove failed peers from active list
+        # Failed peers back off, and are only dropped after repeated failures
         for failed_peer in failed_peers:
-            self.peers.discard(failed_peer)
+            self._note_send_failure(failed_peer)
         
         print(f"📊 Transaction broadcast complete: {broadcast_count} successful, {len(failed_peers)} failed")
         return broadcast_count
     
     def propagate_transaction_to_peers(self, transaction, exclude_peer=None):
         """Propagate received transaction to other peers (avoid broadcast loops)"""
-        message = {
-            'type': 'new_transaction',
-            'transaction': transaction.to_dict(),
-            'node_id': self.node_id,
-            'propagated': True
-        }
+        message = self._announce_transaction(transaction)
         
         propagated_count = 0
         peers_to_propagate = [p for p in self.peers if p != exclude_peer]
         
         print(f"🔄 Propagating transaction {transaction.tx_id[:16]}... to {len(peers_to_propagate)} other peers")
         
+        framed = frame(_dumps(message))
         for peer in peers_to_propagate:
             try:
-                host, port = peer.split(':')
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2)
-                sock.connect((host, int(port)))
-                sock.send(json.dumps(message).encode())
-                sock.close()
+                self._send_to_peer(peer, framed, connect_timeout=2)
                 propagated_count += 1
                 print(f"🔄 Propagated to {peer}")
             except Exception as e:
@@ -714,30 +1317,176 @@ class GSCNetworkNode:
     
     def broadcast_message(self, message, exclude_peer=None):
         """Broadcast message to all connected peers"""
-        data = json.dumps(message).encode()
-        
-        for peer_address in list(self.peers):
-            if exclude_peer and peer_address == exclude_peer:
-                continue
-                
-            try:
-                # This is simplified - in practice you'd maintain persistent connections
-                host, port = peer_address.split(':')
-                peer_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                peer_socket.settimeout(5)
-                peer_socket.connect((host, int(port)))
-                peer_socket.send(data)
-                peer_socket.close()
+        framed = frame(_dumps(message))
+        self._fan_out(framed, exclude_peer)
+    
+    def _fan_out(self, framed, exclude_peer=None, timeout=6):
+        """Send one framed message (or frame stream, see _send_to_peer) to every peer in
+        parallel over the pooled connections; returns how many peers it reached"""
+        futures = [self._broadcast_pool.submit(self._broadcast_to_peer, peer_address, framed)
+                   for peer_address in list(self.peers)
+                   if not (exclude_peer and peer_address == exclude_peer)
+                   and not self._peer_backing_off(peer_address)]
+        # Total latency is the slowest peer (bounded by the connect timeout), not the sum
+        done, _ = wait(futures, timeout=timeout)
+        return sum(1 for future in done if future.result())
+    
+    def _broadcast_to_peer(self, peer_address, framed: bytes):
+        """Send one broadcast to one peer (runs on the broadcast pool)"""
+        try:
+            sent = self._send_to_peer(peer_address, framed, connect_timeout=5)
+            self._note_send_success(peer_address)
 
-                with self._traffic_lock:
-                    self._bytes_sent += len(data)
-                    self._messages_sent += 1
-                    self._last_message_time = time.time()
-                
-            except Exception as e:
-                print(f"Failed to broadcast to {peer_address}: {e}")
-                self.peers.discard(peer_address)
+            with self._traffic_lock:
+                self._bytes_sent += sent
+                self._messages_sent += 1
+                self._last_message_time = time.time()
+            return True
+            
+        except Exception as e:
+            print(f"Failed to broadcast to {peer_address}: {e}")
+            self._note_send_failure(peer_address)
+            return False
+    
+    def _peer_backing_off(self, peer_address) -> bool:
+        """True while a peer that failed recently is waiting out its retry delay"""
+        entry = self._peer_failures.get(peer_address)
+        return entry is not None and entry[1] > time.time()
+    
+    def _note_send_success(self, peer_address):
+        """Clear a peer's failure record after a successful send"""
+        if self._peer_failures:
+            with self._peer_failures_lock:
+                self._peer_failures.pop(peer_address, None)
+    
+    def _note_send_failure(self, peer_address):
+        """Back a peer off exponentially; drop it after PEER_FAILURE_LIMIT consecutive failures"""
+        with self._peer_failures_lock:
+            count = self._peer_failures.get(peer_address, (0, 0))[0] + 1
+            self._peer_failures[peer_address] = (count, time.time() + min(2 ** count, PEER_RETRY_MAX_DELAY))
+        if count > PEER_FAILURE_LIMIT:
+            self.peers.discard(peer_address)
 
+    def _conn_for_socket(self, sock):
+        """The pooled connection wrapping sock (so its send lock is shared), else a fresh wrapper"""
+        with self._peer_conns_lock:
+            conn = next((c for c in self._peer_conns.values() if c.sock is sock), None)
+        return conn or PeerConnection(sock)
+    
+    def _send_framed(self, sock, message):
+        """Send one message on a peer socket without interleaving with concurrent broadcasts"""
+        self._conn_for_socket(sock).send(_dumps(message))
+    
+    def _chain_payload(self, fmt, compressed=False):
+        """Serialized full chain for sync requests, rebuilt only when the chain tip changes
+        ('json': one response message, 'msgpack': a list of per-block frames)"""
+        chain = list(self.blockchain.chain)
+        tip = (len(chain), chain[-1].hash if chain else None)
+        cached = self._chain_cache.get((fmt, compressed))
+        if cached and cached[0] == tip:
+            return cached[1]
+        
+        if fmt == 'msgpack':
+            payload = [_pack_block(block) for block in chain]
+            if compressed:
+                payload = [_compress(block_frame) for block_frame in payload]
+        else:
+            blockchain_data = []
+            for block in chain:
+                block_data = {
+                    'index': block.index,
+                    'timestamp': block.timestamp,
+                    'transactions': [tx.to_dict() for tx in block.transactions],
+                    'previous_hash': block.previous_hash,
+                    'hash': block.hash,
+                    'merkle_root': block.merkle_root,
+                    'nonce': block.nonce,
+                    'difficulty': block.difficulty,
+                    'miner': block.miner,
+                    'reward': block.reward
+                }
+                blockchain_data.append(block_data)
+            
+            payload = _dumps({
+                'type': 'blockchain_response',
+                'blockchain': blockchain_data,
+                'end_of_blockchain': True
+            })
+            if compressed:
+                payload = _compress(payload)
+        
+        self._chain_cache[(fmt, compressed)] = (tip, payload)
+        return payload
+    
+    def _stream_blockchain(self, client_socket, compressed=False):
+        """Send the chain as one msgpack frame per block, then an end-of-stream frame"""
+        frames = self._chain_payload('msgpack', compressed)
+        
+        # send_stream holds the connection for the whole stream so broadcasts can't interleave,
+        # and gathers the length prefixes and block payloads into batched sendmsg calls
+        self._conn_for_socket(client_socket).send_stream(
+            buf for block_frame in frames + [_END_OF_STREAM]
+            for buf in (_FRAME_HEADER.pack(len(block_frame)), block_frame))
+    
+    def _register_peer_conn(self, peer_address, sock):
+        """Remember an open peer socket so broadcasts can reuse it"""
+        with self._peer_conns_lock:
+            conn = self._peer_conns.get(peer_address)
+            if conn is None or conn.sock is not sock:
+                conn = PeerConnection(sock)
+                self._peer_conns[peer_address] = conn
+        return conn
+    
+    def _drop_peer_conn(self, peer_address, sock=None):
+        """Forget a peer socket (only if it is still the registered one when sock is given)"""
+        with self._peer_conns_lock:
+            conn = self._peer_conns.get(peer_address)
+            if conn and (sock is None or conn.sock is sock):
+                del self._peer_conns[peer_address]
+                return conn
+        return None
+    
+    def _get_peer_conn(self, peer_address, connect_timeout=5):
+        """Return the persistent connection to a peer, dialing it once if needed"""
+        with self._peer_conns_lock:
+            conn = self._peer_conns.get(peer_address)
+        if conn:
+            return conn
+        
+        host, port = _split_peer(peer_address)
+        sock = socket.create_connection((host, port), timeout=connect_timeout)
+        sock.settimeout(None)
+        conn = self._register_peer_conn(peer_address, sock)
+        
+        # Read replies on the new connection like any other peer socket
+        self.handle_peer(sock, (host, port))
+        return conn
+    
+    def _open_request_socket(self, peer_address, timeout):
+        """Dial a short-lived request/response socket (replies are read inline, not by the event loop)"""
+        host, port = _split_peer(peer_address)
+        sock = socket.create_connection((host, port), timeout=timeout)
+        _tune_socket(sock)
+        return sock
+    
+    def _send_to_peer(self, peer_address, framed, connect_timeout=5):
+        """Send one framed message (or, given a callable, the stream of frames it returns for
+        peer_address) over the pooled connection; a dead connection is dropped and re-raised.
+        Returns bytes sent."""
+        conn = self._get_peer_conn(peer_address, connect_timeout)
+        try:
+            if callable(framed):
+                return conn.send_stream(framed(peer_address))
+            conn.send_framed(framed)
+            return len(framed)
+        except OSError:
+            if self._drop_peer_conn(peer_address, conn.sock):
+                try:
+                    conn.sock.close()
+                except OSError:
+                    pass
+            raise
+    
     def get_network_traffic(self):
         """Traffic counters for GUI"""
         with self._traffic_lock:
@@ -755,7 +1504,7 @@ class GSCNetworkNode:
     def get_peer_list(self):
         """Compatibility helper for RPC/UI"""
         peers = []
-        for addr in sorted(self.peers):
+        for addr in self.peers.sorted():
             peers.append({
                 "addr": addr,
                 "subver": "/GSCCoin:1.0/",
@@ -769,7 +1518,7 @@ class GSCNetworkNode:
             "node_id": self.node_id,
             "port": self.port,
             "peers_connected": len(self.peers),
-            "peers": sorted(self.peers),
+            "peers": list(self.peers.sorted()),
             "chain_length": len(self.blockchain.chain),
             "mempool_size": len(self.blockchain.mempool),
             "running": self.running,
@@ -777,19 +1526,87 @@ class GSCNetworkNode:
         }
     
     def serialize_block(self, block):
-        """Serialize block for network transmission"""
-        return {
+        """Serialize block for network transmission (memoized on the block until its hash changes)"""
+        cached = block._wire_dict
+        if cached and cached[0] == block.hash:
+            return cached[1]
+        
+        block_data = {
             'index': block.index,
             'timestamp': block.timestamp,
             'transactions': [self.serialize_transaction(tx) for tx in block.transactions],
             'previous_hash': block.previous_hash,
             'hash': block.hash,
-            'merkle_root': getattr(block, 'merkle_root', ''),
+            'merkle_root': block.merkle_root,
+            'nonce': block.nonce,
+            'difficulty': block.difficulty,
+            'miner': block.miner,
+            'reward': block.reward
+        }
+        block._wire_dict = (block.hash, block_data)
+        return block_data
+    
+    def _block_frame(self, block, compressed=False) -> bytes:
+        """Framed JSON of serialize_block(block), optionally zstd-compressed; memoized on the
+        block like serialize_block"""
+        cached = block._wire_frame_zstd if compressed else block._wire_frame
+        if cached and cached[0] == block.hash:
+            return cached[1]
+        
+        payload = _dumps(self.serialize_block(block))
+        if compressed:
+            framed = frame(_compress(payload))
+            block._wire_frame_zstd = (block.hash, framed)
+        else:
+            framed = frame(payload)
+            block._wire_frame = (block.hash, framed)
+        return framed
+    
+    def _note_peer_compression(self, address, handshake):
+        """Remember whether a peer's handshake advertised zstd support"""
+        peer_address = f"{address[0]}:{address[1]}"
+        if zstd and 'zstd' in (handshake.get('compression') or ()):
+            self._zstd_peers.add(peer_address)
+        else:
+            self._zstd_peers.discard(peer_address)
+    
+    def block_header(self, block):
+        """Header fields of a block for headers/getdata messages (memoized like serialize_block)"""
+        cached = block._wire_header
+        if cached and cached[0] == block.hash:
+            return cached[1]
+        
+        header_data = {
+            'hash': block.hash,
+            'prev_hash': block.previous_hash,
+            'merkle_root': block.merkle_root,
+            'timestamp': block.timestamp,
+            'difficulty': block.difficulty,
             'nonce': block.nonce,
-            'difficulty': getattr(block, 'difficulty', 4),
-            'miner': getattr(block, 'miner', ''),
-            'reward': getattr(block, 'reward', 0)
+            'height': block.index
         }
+        block._wire_header = (block.hash, header_data)
+        return header_data
+    
+    def _header_json(self, block) -> bytes:
+        """Encoded JSON of block_header(block), memoized like block_header"""
+        cached = block._wire_header_json
+        if cached and cached[0] == block.hash:
+            return cached[1]
+        
+        encoded = _dumps(self.block_header(block))
+        block._wire_header_json = (block.hash, encoded)
+        return encoded
+    
+    def _tx_json(self, tx) -> bytes:
+        """Encoded JSON of tx.to_dict(), memoized on the transaction like to_dict itself"""
+        cached = tx._wire_json
+        if cached and cached[0] == tx.tx_id and cached[1] == tx.signature:
+            return cached[2]
+        
+        encoded = _dumps(tx.to_dict())
+        tx._wire_json = (tx.tx_id, tx.signature, encoded)
+        return encoded
     
     def deserialize_block(self, block_data):
         """Deserialize block from network data"""
@@ -819,9 +1636,9 @@ class GSCNetworkNode:
             'sender': transaction.sender,
             'receiver': transaction.receiver,
             'amount': transaction.amount,
-            'fee': getattr(transaction, 'fee', 0),
+            'fee': transaction.fee,
             'timestamp': transaction.timestamp,
-            'tx_id': getattr(transaction, 'tx_id', '')
+            'tx_id': transaction.tx_id
         }
     
     def deserialize_transaction(self, tx_data):
@@ -831,13 +1648,13 @@ class GSCNetworkNode:
         transaction = Transaction(
             sender=tx_data['sender'],
             receiver=tx_data['receiver'],
-            amount=tx_data['amount']
+            amount=tx_data['amount'],
+            fee=tx_data.get('fee', 0),
+            timestamp=tx_data['timestamp'],
+            signature=tx_data.get('signature', ''),
+            tx_id=tx_data.get('tx_id', '')
         )
         
-        transaction.fee = tx_data.get('fee', 0)
-        transaction.timestamp = tx_data['timestamp']
-        transaction.tx_id = tx_data.get('tx_id', '')
-        
         return transaction
     
     def is_valid_chain(self, chain):
@@ -848,7 +1665,19 @@ class GSCNetworkNode:
             return False
     
     def get_local_ip(self):
-        """Get local IP address for network connectivity"""
+        """Get local IP address for network connectivity (cached after the first lookup)"""
+        ip = self._local_ip
+        if ip is None:
+            ip = self._local_ip = self._detect_local_ip()
+        return ip
+    
+    def refresh_local_ip(self):
+        """Re-detect the local IP address, e.g. after the machine moved networks"""
+        self._local_ip = self._detect_local_ip()
+        return self._local_ip
+    
+    def _detect_local_ip(self):
+        """Look up the local IP address (UDP route probe, then hostname/ipconfig fallbacks)"""
         try:
             # Try to get actual network IP
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -874,7 +1703,6 @@ class GSCNetworkNode:
             except:
                 return "127.0.0.1"
     
-<<<<<<< Updated upstream
     def broadcast_blockchain(self):
         """Broadcast entire blockchain to all connected peers"""
         if not self.peers:
@@ -882,37 +1710,32 @@ class GSCNetworkNode:
             return False
         
         try:
-            blockchain_data = {
+            chain = list(self.blockchain.chain)
+            header = {
                 'type': 'blockchain_broadcast',
-                'chain': [self.serialize_block(block) for block in self.blockchain.chain],
                 'node_id': self.node_id,
-                'timestamp': datetime.now().isoformat(),
-                'chain_length': len(self.blockchain.chain)
+                'timestamp': time.time(),
+                'chain_length': len(chain)
             }
+            headers = {False: frame(_dumps(header)),
+                       True: frame(_dumps(dict(header, compression='zstd')))}
             
-            broadcast_count = 0
-            for peer_address in list(self.peers):
-                try:
-                    host, port = peer_address.split(':')
-                    peer_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    peer_socket.settimeout(10)
-                    peer_socket.connect((host, int(port)))
-                    
-                    data = json.dumps(blockchain_data).encode()
-                    peer_socket.send(data)
-                    peer_socket.close()
-                    broadcast_count += 1
-                    print(f"Blockchain broadcasted to {peer_address}")
-                    
-                except Exception as e:
-                    print(f"Failed to broadcast blockchain to {peer_address}: {e}")
-                    self.peers.discard(peer_address)
+            def chain_stream(peer_address):
+                # Header, then chain_length block frames (zstd for peers that accept it);
+                # each block is encoded once and reused
+                compressed = peer_address in self._zstd_peers
+                yield headers[compressed]
+                for block in chain:
+                    yield self._block_frame(block, compressed)
+            
+            # Same pooled, parallel fan-out as broadcast_message (larger payload, longer wait)
+            broadcast_count = self._fan_out(chain_stream, timeout=30)
             
-            print(f"Blockchain broadcast completed to {broadcast_count} peers")
+            logger.debug("Blockchain broadcast completed to %d peers", broadcast_count)
             return broadcast_count > 0
             
         except Exception as e:
-            print(f"Error broadcasting blockchain: {e}")
+            logger.warning("Error broadcasting blockchain: %s", e)
             return False
     
     def request_blockchain_from_peers(self):
@@ -924,37 +1747,18 @@ class GSCNetworkNode:
         request_message = {
             'type': 'get_blockchain',
             'node_id': self.node_id,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': time.time()
         }
         
-        request_count = 0
-        for peer_address in list(self.peers):
-            try:
-                host, port = peer_address.split(':')
-                peer_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                peer_socket.settimeout(5)
-                peer_socket.connect((host, int(port)))
-                
-                data = json.dumps(request_message).encode()
-                peer_socket.send(data)
-                peer_socket.close()
-                request_count += 1
-                print(f"Blockchain requested from {peer_address}")
-                
-            except Exception as e:
-                print(f"Failed to request blockchain from {peer_address}: {e}")
-                self.peers.discard(peer_address)
+        framed = frame(_dumps(request_message))
+        request_count = self._fan_out(framed)
         
-        print(f"Blockchain requested from {request_count} peers")
+        logger.debug("Blockchain requested from %d peers", request_count)
         return request_count > 0
 
-    def get_network_stats(self):
-        """Get network statistics"""
-=======
     def get_network_addresses(self):
         """Get all network connection information for display"""
         local_ip = self.get_local_ip()
->>>>>>> Stashed changes
         return {
             'local_ip': local_ip,
             'p2p_address': f"{local_ip}:{self.port}",
@@ -977,27 +1781,23 @@ class GSCNetworkNode:
         self._request_headers(peer_addr, self.blockchain.get_latest_block().hash)
     
     def _request_headers(self, peer_addr: str, from_hash: str):
-        """Request headers from a specific block (Bitcoin getheaders)"""
+        """Request headers from a specific block (Bitcoin getheaders) over the pooled connection"""
         try:
-            host, port = peer_addr.split(':')
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(10)
-                sock.connect((host, int(port)))
-                
-                getheaders_msg = {
-                    "type": "getheaders",
-                    "from_block": from_hash,
-                    "node_id": self.node_id
-                }
-                
-                sock.send(json.dumps(getheaders_msg).encode())
-                print(f"📤 Requested headers from {from_hash[:16]}... to {peer_addr}")
+            getheaders_msg = {
+                "type": "getheaders",
+                "from_block": from_hash,
+                "node_id": self.node_id
+            }
+            
+            # The headers reply arrives on the same connection and is served by the event loop
+            self._send_to_peer(peer_addr, frame(_dumps(getheaders_msg)))
+            logger.debug("📤 Requested headers from %s... to %s", from_hash[:16], peer_addr)
                 
         except Exception as e:
-            print(f"❌ Failed to request headers from {peer_addr}: {e}")
+            logger.warning("❌ Failed to request headers from %s: %s", peer_addr, e)
     
-    def _handle_getheaders(self, message: dict, client_socket) -> dict:
-        """Handle getheaders request (Bitcoin-style)"""
+    def _handle_getheaders(self, message: dict, client_socket) -> bytes:
+        """Handle getheaders request (Bitcoin-style); the response is spliced from cached header bytes"""
         from_block = message.get("from_block", "")
         
         # Find headers after from_block
@@ -1005,75 +1805,66 @@ class GSCNetworkNode:
         
         try:
             # Find the block in our chain
-            from_index = 0
-            for i, block in enumerate(self.blockchain.chain):
-                if block.hash == from_block:
-                    from_index = i + 1
-                    break
+            found = self.blockchain.get_block_index(from_block)
+            from_index = found + 1 if found is not None else 0
             
             # Send up to 2000 headers (Bitcoin limit)
-            for i in range(from_index, min(from_index + 2000, len(self.blockchain.chain))):
-                block = self.blockchain.chain[i]
-                header_data = {
-                    'hash': block.hash,
-                    'prev_hash': block.previous_hash,
-                    'merkle_root': getattr(block, 'merkle_root', ''),
-                    'timestamp': block.timestamp,
-                    'difficulty': getattr(block, 'difficulty', 4),
-                    'nonce': block.nonce,
-                    'height': block.index
-                }
-                headers_to_send.append(header_data)
+            header_json = self._header_json
+            headers_to_send = [header_json(block) for block in self.blockchain.chain[from_index:from_index + 2000]]
         
         except Exception as e:
-            print(f"Error building headers response: {e}")
+            logger.warning("Error building headers response: %s", e)
         
-        print(f"📤 Sending {len(headers_to_send)} headers")
+        logger.debug("📤 Sending %d headers", len(headers_to_send))
         
-        return {
-            "type": "headers",
-            "headers": headers_to_send,
-            "count": len(headers_to_send)
-        }
+        return b''.join((b'{"type":"headers","headers":[', b','.join(headers_to_send),
+                         b'],"count":', str(len(headers_to_send)).encode(), b'}'))
     
     def _handle_headers(self, message: dict, client_socket):
         """Handle received headers (Bitcoin-style)"""
         headers_data = message.get("headers", [])
         
         if not headers_data:
-            print(f"📥 No new headers received, starting blocks sync")
+            logger.debug("📥 No new headers received, starting blocks sync")
             self._start_blocks_sync()
             return
         
-        print(f"📥 Received {len(headers_data)} headers")
+        logger.debug("📥 Received %d headers", len(headers_data))
         self._start_blocks_sync()
     
     def _start_blocks_sync(self):
         """Start block download phase"""
-        print(f"📦 Starting blocks sync phase")
+        logger.debug("📦 Starting blocks sync phase")
         self.sync_mode = "blocks"
         self._start_mempool_sync()
     
     def _start_mempool_sync(self):
         """Start mempool sync phase"""
-        print(f"💼 Starting mempool sync phase")
+        logger.debug("💼 Starting mempool sync phase")
         self.sync_mode = "mempool"
         
-        # Request mempool from connected peers
-        for peer_addr in list(self.peers):
-            try:
-                mempool_data = self.request_mempool_from_peer(peer_addr)
-                if mempool_data:
-                    print(f"📥 Received {len(mempool_data)} mempool transactions")
+        # Ask every connected peer at once and take the first non-empty answer, so slow
+        # peers cost one timeout in total instead of one each
+        pending = {self._broadcast_pool.submit(self.request_mempool_from_peer, peer_addr, 5)
+                   for peer_addr in list(self.peers)}
+        deadline = time.monotonic() + 5
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()),
+                                 return_when=FIRST_COMPLETED)
+            mempool_data = next((future.result() for future in done if future.result()), None)
+            if mempool_data:
+                logger.debug("📥 Received %d mempool transactions", len(mempool_data))
                 break
-            except Exception as e:
-                print(f"❌ Error syncing mempool from {peer_addr}: {e}")
+            if not done:
+                break  # Deadline passed
+        for future in pending:
+            future.cancel()
         
         self._enter_live_mode()
     
     def _enter_live_mode(self):
         """Enter live sync mode - Bitcoin-style sync complete"""
-        print(f"🎉 Bitcoin-style sync complete! Entering live mode.")
+        logger.info("🎉 Bitcoin-style sync complete! Entering live mode.")
         self.sync_mode = "live"
         self.sync_complete = True
         self.syncing_with.clear()
@@ -1088,7 +1879,7 @@ class GSCNetworkNode:
                 block = self.blockchain.chain[i]
                 available_blocks.append(block.hash)
         
-        print(f"📤 Sending inventory of {len(available_blocks)} blocks")
+        logger.debug("📤 Sending inventory of %d blocks", len(available_blocks))
         
         return {
             "type": "inv",
@@ -1097,36 +1888,76 @@ class GSCNetworkNode:
         }
     
     def _handle_inv(self, message: dict, client_socket):
-        """Handle block inventory (Bitcoin-style)"""
+        """Handle block/transaction inventory (Bitcoin-style)"""
         available_blocks = message.get("blocks", [])
-        print(f"📥 Received inventory of {len(available_blocks)} blocks")
+        if available_blocks:
+            logger.debug("📥 Received inventory of %d blocks", len(available_blocks))
+        
+        # Ask only for transactions we haven't seen yet and haven't already requested from
+        # another peer (an unanswered request expires, so the id can be fetched elsewhere)
+        now = time.monotonic()
+        missing = []
+        with self._tx_requested_lock:
+            requested = self._tx_requested
+            while requested and next(iter(requested.values())) <= now:
+                requested.popitem(last=False)
+            for tx_id in message.get("txs", []):
+                if tx_id not in requested and tx_id not in self._tx_seen:
+                    requested[tx_id] = now + TX_REQUEST_TIMEOUT
+                    missing.append(tx_id)
+            while len(requested) > MAX_RELAY_TRANSACTIONS:
+                requested.popitem(last=False)
+        if missing:
+            return {"type": "getdata", "txs": missing}
+        return None
     
-    def _handle_getdata(self, message: dict, client_socket) -> dict:
+    def _handle_getdata(self, message: dict, client_socket) -> bytes:
         """Handle getdata request (Bitcoin-style)"""
+        tx_ids = message.get("txs")
+        if tx_ids:
+            mempool = None
+            for tx_id in tx_ids:
+                tx_data = self._tx_relay.get(tx_id)
+                if tx_data is None:
+                    if mempool is None:
+                        mempool = {tx.tx_id: tx for tx in self.blockchain.mempool}
+                    tx = mempool.get(tx_id)
+                    tx_data = tx.to_dict() if tx else None
+                if tx_data:
+                    # Delivered as new_transaction so the receiver validates and relays it as usual
+                    self._send_framed(client_socket, {
+                        'type': 'new_transaction',
+                        'transaction': tx_data,
+                        'node_id': self.node_id
+                    })
+            return None
+        
         block_hash = message.get("block")
         
-        if block_hash:
-            for block in self.blockchain.chain:
-                if block.hash == block_hash:
-                    print(f"📤 Sending block {block_hash[:16]}...")
-                    
-                    block_data = {
-                        'header': {
-                            'hash': block.hash,
-                            'prev_hash': block.previous_hash,
-                            'merkle_root': getattr(block, 'merkle_root', ''),
-                            'timestamp': block.timestamp,
-                            'difficulty': getattr(block, 'difficulty', 4),
-                            'nonce': block.nonce,
-                            'height': block.index
-                        },
-                        'transactions': [tx.to_dict() for tx in block.transactions]
-                    }
-                    
-                    return {
-                        "type": "block",
-                        "block": block_data
-                    }
+        block = self.blockchain.get_block_by_hash(block_hash) if block_hash else None
+        if block:
+            logger.debug("📤 Sending block %s...", block_hash[:16])
+            
+            with self._block_responses_lock:
+                response = self._block_responses.get(block_hash)
+                if response is not None:
+                    self._block_responses.move_to_end(block_hash)
+                    return response
+            
+            block_data = {
+                'header': self.block_header(block),
+                'transactions': [tx.to_dict() for tx in block.transactions]
+            }
+            
+            response = _dumps({
+                "type": "block",
+                "block": block_data
+            })
+            with self._block_responses_lock:
+                self._block_responses[block_hash] = response
+                while len(self._block_responses) > MAX_CACHED_BLOCK_RESPONSES:
+                    self._block_responses.popitem(last=False)
+            return response
         
         return None
     
@@ -1137,30 +1968,42 @@ class GSCNetworkNode:
         if block_data:
             block_hash = block_data.get('header', {}).get('hash', 'unknown')
             tx_count = len(block_data.get('transactions', []))
-            print(f"📥 Received block {block_hash[:16]}... with {tx_count} transactions")
+            logger.debug("📥 Received block %s... with %d transactions", block_hash[:16], tx_count)
     
-    def _handle_mempool_request(self, message: dict, client_socket) -> dict:
-        """Handle mempool request (Bitcoin-style)"""
-        transactions = [tx.to_dict() for tx in self.blockchain.mempool]
+    def _handle_mempool_request(self, message: dict, client_socket) -> bytes:
+        """Handle mempool request (Bitcoin-style), one page of transactions after `since` at a time"""
+        try:
+            since = int(message.get("since", 0))
+            limit = max(1, min(int(message.get("limit", MAX_MEMPOOL_PAGE)), MAX_MEMPOOL_PAGE))
+        except (TypeError, ValueError):
+            since, limit = 0, MAX_MEMPOOL_PAGE
         
-        print(f"📤 Sending {len(transactions)} mempool transactions")
+        # One extra entry tells us whether the requester needs another round
+        page = self.blockchain.mempool_page(since, limit + 1)
+        more = len(page) > limit
+        page = page[:limit]
+        tx_json = self._tx_json
+        transactions = [tx_json(tx) for _, tx in page]
         
-        return {
-            "type": "tx",
-            "transactions": transactions,
-            "count": len(transactions)
-        }
+        logger.debug("📤 Sending %d mempool transactions", len(transactions))
+        
+        # Spliced from the cached per-transaction bytes, like the headers response
+        return b''.join((b'{"type":"tx","transactions":[', b','.join(transactions),
+                         b'],"count":', str(len(transactions)).encode(),
+                         b',"last_seq":', str(page[-1][0] if page else since).encode(),
+                         b',"more":', b'true' if more else b'false', b'}'))
     
     def _handle_transaction_batch(self, message: dict, client_socket):
         """Handle received transaction batch (Bitcoin-style)"""
         transactions_data = message.get("transactions", [])
         
         if transactions_data:
-            print(f"📥 Received {len(transactions_data)} transactions")
+            logger.debug("📥 Received %d transactions", len(transactions_data))
             
-            for tx_data in transactions_data:
-                try:
-                    from blockchain import Transaction
+            try:
+                from blockchain import Transaction
+                transactions = []
+                for tx_data in transactions_data:
                     tx = Transaction(
                         sender=tx_data.get('sender'),
                         receiver=tx_data.get('receiver'),
@@ -1170,29 +2013,56 @@ class GSCNetworkNode:
                         signature=tx_data.get('signature')
                     )
                     tx.tx_id = tx_data.get('tx_id')
-                    
-                    if self.blockchain.add_transaction_to_mempool(tx):
-                        print(f"✅ Added transaction: {tx.tx_id[:16]}...")
-                except Exception as e:
-                    print(f"❌ Error processing transaction: {e}")
+                    transactions.append(tx)
+                
+                added_count = self.blockchain.add_transactions_to_mempool(transactions)
+                logger.debug("✅ Added %d/%d transactions", added_count, len(transactions))
+            except Exception as e:
+                logger.warning("❌ Error processing transaction batch: %s", e)
     
     def get_sync_status(self) -> dict:
-        """Get Bitcoin-style sync status for GUI"""
-        return {
+        """Get Bitcoin-style sync status for GUI (rebuilt only when the inputs change; treat as read-only)"""
+        chain = self.blockchain.chain
+        key = (self.blockchain.version, len(chain), len(self.blockchain.mempool), self.sync_mode,
+               self.sync_complete, len(self.peers), tuple(self.syncing_with))
+        cached = self._sync_status_cache
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        status = {
             "sync_mode": self.sync_mode,
             "sync_complete": self.sync_complete,
             "syncing_with": list(self.syncing_with),
-            "chain_height": len(self.blockchain.chain) - 1,
-            "chain_tip": self.blockchain.get_latest_block().hash[:16] + "..." if self.blockchain.chain else "N/A",
+            "chain_height": len(chain) - 1,
+            "chain_tip": chain[-1].hash[:16] + "..." if chain else "N/A",
             "mempool_size": len(self.blockchain.mempool),
             "connected_peers": len(self.peers)
         }
+        self._sync_status_cache = (key, status)
+        return status
     
     def stop(self):
         """Stop the network node"""
         self.running = False
-        if self.server_socket:
-            self.server_socket.close()
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            pass
+        for listen_socket in self._listen_sockets:
+            try:
+                listen_socket.close()
+            except OSError:
+                pass
+        self._peer_workers.shutdown(wait=False)
+        self._broadcast_pool.shutdown(wait=False)
+        with self._peer_conns_lock:
+            conns = list(self._peer_conns.values())
+            self._peer_conns.clear()
+        for conn in conns:
+            try:
+                conn.sock.close()
+            except OSError:
+                pass
         print("GSC Network node stopped")
     
     def get_network_stats(self) -> dict:
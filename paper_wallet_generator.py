@@ -1,18 +1,116 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from wallet_manager import WalletManager
-import qrcode
-from PIL import Image, ImageDraw, ImageFont, ImageTk
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
+import io
+import queue
+import re
+import threading
+import uuid
+
+# Pillow, qrcode and NumPy are imported where they are first used, so importing this module
+# (e.g. from the wallet GUI) doesn't load them until a paper wallet is actually drawn
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """NumPy if it is installed (imported on first use), else None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# Splits an address or key into the 50-character lines printed on the wallet
+_CODE_LINES = re.compile(r'.{1,50}', re.DOTALL)
+
+# Mask pattern used for paper wallet QR codes (0-7)
+QR_MASK_PATTERN = 0
 
 class PaperWalletGenerator:
     """Professional paper wallet generator for GSC Coin"""
     
+    # Preview sketch shared by every dialog (see _preview_image); each dialog wraps it in its
+    # own PhotoImage since those belong to one Tk interpreter
+    _preview = None
+    
     def __init__(self, parent=None):
         self.parent = parent
         self.wallet_manager = WalletManager()
         
+        # Fonts loaded so far, keyed by (font file, size); reused across wallets in a batch
+        self._fonts = {}
+        self._text_widths = {}
+        
+        # Static wallet layouts keyed by include_qr (see _wallet_template)
+        self._templates = {}
+        self._template_lock = threading.Lock()
+    
+    def _get_font(self, name, size):
+        """Load a TrueType font once per (name, size), falling back to Pillow's default font"""
+        font = self._fonts.get((name, size))
+        if font is None:
+            from PIL import ImageFont
+            try:
+                font = ImageFont.truetype(name, size)
+            except Exception:
+                font = ImageFont.load_default()
+            self._fonts[(name, size)] = font
+        return font
+    
+    def _center_x(self, text, font, width):
+        """x offset that centers text across width (text widths are memoized per font)"""
+        text_width = self._text_widths.get((text, font))
+        if text_width is None:
+            if len(self._text_widths) > 256:
+                self._text_widths.clear()
+            text_width = self._text_widths[(text, font)] = int(font.getlength(text))
+        return (width - text_width) // 2
+    
+    def _line_spacing(self, font, pitch):
+        """multiline_text spacing that puts successive lines pitch pixels apart"""
+        # Pillow advances each line by the height of "A" plus the spacing
+        return pitch - font.getbbox("A")[3]
+    
+    def _make_qr(self, data, size=120):
+        """Render data as a size x size pixel QR code"""
+        import qrcode
+        
+        # A fixed mask skips scoring all eight mask patterns (each one a full matrix build
+        # in pure Python); any mask gives a valid code
+        qr = qrcode.QRCode(version=1, box_size=4, border=2, mask_pattern=QR_MASK_PATTERN)
+        qr.add_data(data)
+        qr.make(fit=True)
+        
+        # Pick the largest whole-pixel module size that fits, so at most a small stretch is left
+        qr.box_size = max(1, size // (qr.modules_count + 2 * qr.border))
+        
+        from PIL import Image
+        
+        np = _numpy()
+        if np is not None:
+            # Scale the module matrix with NumPy instead of qrcode's per-module rectangle drawing
+            modules = np.pad(np.array(qr.modules, dtype=bool), qr.border)
+            pixels = np.where(modules, 0, 255).astype(np.uint8)
+            pixels = pixels.repeat(qr.box_size, axis=0).repeat(qr.box_size, axis=1)
+            img = Image.fromarray(pixels)
+        else:
+            img = qr.make_image(fill_color="black", back_color="white").get_image()
+        
+        # Whole-pixel modules usually fall a little short of the slot; stretch the remainder
+        # with a nearest-neighbour resize (no smoothing) so the code fills it as before
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.NEAREST)
+        return img
+    
+    def _paste_qr(self, img, data, position, size=120):
+        """Paste the QR code for data centered in the size x size box at position"""
+        qr_img = self._make_qr(data, size)
+        x, y = position
+        img.paste(qr_img, (x + (size - qr_img.width) // 2, y + (size - qr_img.height) // 2))
+        
     def show_paper_wallet_dialog(self):
         """Show paper wallet generation dialog"""
         dialog = tk.Toplevel(self.parent if self.parent else tk.Tk())
@@ -57,19 +155,19 @@ class PaperWalletGenerator:
         preview_canvas = tk.Canvas(preview_frame, width=500, height=200, bg='white', relief=tk.SUNKEN, bd=2)
         preview_canvas.pack(pady=10)
         
-        # Draw sample preview
-        preview_canvas.create_text(250, 30, text="GSC Coin Paper Wallet", font=("Arial", 14, "bold"))
-        preview_canvas.create_text(250, 60, text="Public Address: GSC1a2b3c4d5e6f7g8h9i0j...", font=("Arial", 10))
-        preview_canvas.create_text(250, 90, text="Private Key: [HIDDEN - Will be shown on actual wallet]", font=("Arial", 10))
-        preview_canvas.create_rectangle(50, 110, 150, 180, outline="black")
-        preview_canvas.create_text(100, 145, text="Address\nQR Code", font=("Arial", 8))
-        preview_canvas.create_rectangle(350, 110, 450, 180, outline="black")
-        preview_canvas.create_text(400, 145, text="Private Key\nQR Code", font=("Arial", 8))
+        # Draw sample preview (one pre-rendered image instead of separate canvas items)
+        from PIL import ImageTk
+        preview_photo = ImageTk.PhotoImage(self._preview_image(), master=dialog)
+        preview_canvas.create_image(0, 0, anchor=tk.NW, image=preview_photo)
+        preview_canvas.image = preview_photo  # Keep a reference
         
         # Buttons frame
         button_frame = ttk.Frame(dialog)
         button_frame.pack(fill=tk.X, padx=20, pady=10)
         
+        # Shown while wallets are being generated
+        progress = ttk.Progressbar(dialog, mode='indeterminate')
+        
         def generate_paper_wallets():
             """Generate paper wallets"""
             try:
@@ -82,169 +180,252 @@ class PaperWalletGenerator:
                 if not save_dir:
                     return
                 
-                generated_wallets = []
+                # One timestamp for the whole batch; the random suffix keeps filenames unique
+                now = datetime.now()
+                file_stamp = now.strftime('%Y%m%d_%H%M%S')
+                generated_at = now.strftime('%Y-%m-%d %H:%M:%S UTC')
                 
-                for i in range(count):
-                    # Generate wallet data
-                    address, private_key = self.wallet_manager.generate_address()
+                # Finished PNGs are written to disk by one background thread
+                write_queue = queue.Queue()
+                write_errors = []
+                
+                def write_files():
+                    while True:
+                        item = write_queue.get()
+                        if item is None:
+                            return
+                        filepath, data = item
+                        try:
+                            with open(filepath, 'wb') as f:
+                                f.write(data)
+                        except OSError as e:
+                            write_errors.append(e)
+                
+                writer = threading.Thread(target=write_files, daemon=True)
+                writer.start()
+                
+                def build_one(i, key):
+                    # Wallet data generated for the whole batch up front
+                    address, private_key, _ = key
                     
                     # Create paper wallet image
                     wallet_image = self.create_paper_wallet_image(
-                        address, private_key, include_qr, high_security, i + 1
+                        address, private_key, include_qr, high_security, i + 1, generated_at
                     )
                     
-                    # Save wallet
-                    filename = f"GSC_Paper_Wallet_{i+1}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                    filepath = os.path.join(save_dir, filename)
-                    wallet_image.save(filepath)
+                    # Encode in memory (fast zlib level; the PNG is printed once) and hand the
+                    # bytes to the writer thread
+                    filename = f"GSC_Paper_Wallet_{i+1}_{file_stamp}_{uuid.uuid4().hex[:6]}.png"
+                    buffer = io.BytesIO()
+                    wallet_image.save(buffer, format='PNG', compress_level=1)
+                    write_queue.put((os.path.join(save_dir, filename), buffer.getvalue()))
                     
-                    generated_wallets.append({
+                    return {
                         'address': address,
                         'private_key': private_key,
                         'filename': filename
-                    })
+                    }
                 
-                # Show success message
-                success_msg = f"Successfully generated {count} paper wallet(s)!\n\n"
-                success_msg += f"Saved to: {save_dir}\n\n"
-                success_msg += "IMPORTANT SECURITY NOTES:\n"
-                success_msg += "• Print these wallets and store them securely\n"
-                success_msg += "• Never share your private keys\n"
-                success_msg += "• Keep multiple copies in safe locations\n"
-                success_msg += "• Delete digital copies after printing"
+                def finish(generated_wallets, error):
+                    progress.stop()
+                    progress.pack_forget()
+                    generate_button.config(state=tk.NORMAL)
+                    
+                    if error:
+                        messagebox.showerror("Error", f"Failed to generate paper wallets: {str(error)}")
+                        return
+                    
+                    # Show success message
+                    success_msg = f"Successfully generated {count} paper wallet(s)!\n\n"
+                    success_msg += f"Saved to: {save_dir}\n\n"
+                    success_msg += "IMPORTANT SECURITY NOTES:\n"
+                    success_msg += "• Print these wallets and store them securely\n"
+                    success_msg += "• Never share your private keys\n"
+                    success_msg += "• Keep multiple copies in safe locations\n"
+                    success_msg += "• Delete digital copies after printing"
+                    
+                    messagebox.showinfo("Paper Wallets Generated", success_msg)
+                    
+                    # Show wallet details
+                    self.show_wallet_details(generated_wallets)
+                    
+                    dialog.destroy()
                 
-                messagebox.showinfo("Paper Wallets Generated", success_msg)
+                # The worker only puts its result here; Tk calls stay on the Tk thread, which
+                # polls for it while the progress bar runs
+                result_queue = queue.Queue()
                 
-                # Show wallet details
-                self.show_wallet_details(generated_wallets)
+                def poll_result():
+                    try:
+                        generated_wallets, error = result_queue.get_nowait()
+                    except queue.Empty:
+                        dialog.after(50, poll_result)
+                        return
+                    finish(generated_wallets, error)
+                
+                def worker():
+                    # Runs off the Tk thread; the result is handed back through result_queue
+                    generated_wallets, error = None, None
+                    try:
+                        keys = self.wallet_manager.generate_addresses(count)
+                        
+                        # QR drawing and PNG compression release the GIL, so wallets are built
+                        # in parallel; map keeps the results in wallet order
+                        try:
+                            with ThreadPoolExecutor(max_workers=min(count, os.cpu_count() or 1)) as pool:
+                                generated_wallets = list(pool.map(build_one, range(count), keys))
+                        finally:
+                            write_queue.put(None)
+                            writer.join()
+                        if write_errors:
+                            raise write_errors[0]
+                    except Exception as e:
+                        error = e
+                    
+                    result_queue.put((generated_wallets, error))
                 
-                dialog.destroy()
+                generate_button.config(state=tk.DISABLED)
+                progress.pack(fill=tk.X, padx=20, pady=(0, 10))
+                progress.start(10)
+                threading.Thread(target=worker, daemon=True).start()
+                dialog.after(50, poll_result)
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to generate paper wallets: {str(e)}")
         
-        ttk.Button(button_frame, text="Generate Paper Wallets", 
-                  command=generate_paper_wallets).pack(side=tk.LEFT, padx=5)
+        generate_button = ttk.Button(button_frame, text="Generate Paper Wallets", 
+                                     command=generate_paper_wallets)
+        generate_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancel", 
                   command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
         
         if not self.parent:
             dialog.mainloop()
     
-    def create_paper_wallet_image(self, address, private_key, include_qr=True, high_security=False, wallet_num=1):
-        """Create paper wallet image"""
-        # Image dimensions
-        width, height = 800, 600
-        
-        # Create image
-        img = Image.new('RGB', (width, height), 'white')
+    def _preview_image(self):
+        """Sample wallet sketch for the dialog's preview canvas (rendered once per process)"""
+        if PaperWalletGenerator._preview is None:
+            from PIL import Image, ImageDraw
+            
+            preview = Image.new('RGB', (500, 200), 'white')
+            draw = ImageDraw.Draw(preview)
+            
+            title_font = self._get_font("arialbd.ttf", 14)
+            text_font = self._get_font("arial.ttf", 10)
+            small_font = self._get_font("arial.ttf", 8)
+            
+            draw.text((250, 30), "GSC Coin Paper Wallet", fill="black", font=title_font, anchor="mm")
+            draw.text((250, 60), "Public Address: GSC1a2b3c4d5e6f7g8h9i0j...", fill="black", font=text_font, anchor="mm")
+            draw.text((250, 90), "Private Key: [HIDDEN - Will be shown on actual wallet]", fill="black",
+                      font=text_font, anchor="mm")
+            draw.rectangle([50, 110, 150, 180], outline="black")
+            draw.multiline_text((100, 145), "Address\nQR Code", fill="black", font=small_font, anchor="mm", align="center")
+            draw.rectangle([350, 110, 450, 180], outline="black")
+            draw.multiline_text((400, 145), "Private Key\nQR Code", fill="black", font=small_font, anchor="mm", align="center")
+            
+            PaperWalletGenerator._preview = preview
+        return PaperWalletGenerator._preview
+    
+    def _wallet_template(self, include_qr):
+        """Blank paper wallet with every element that is the same on all wallets (built once
+        per include_qr setting; create_paper_wallet_image copies it)"""
+        with self._template_lock:
+            template = self._templates.get(include_qr)
+            if template is not None:
+                return template
+            
+            from PIL import Image, ImageDraw
+            
+            # Image dimensions
+            width, height = 800, 600
+            
+            template = Image.new('RGB', (width, height), 'white')
+            draw = ImageDraw.Draw(template)
+            
+            header_font = self._get_font("arial.ttf", 14)
+            small_font = self._get_font("arial.ttf", 10)
+            
+            # Draw border
+            draw.rectangle([10, 10, width-10, height-10], outline="black", width=3)
+            draw.rectangle([20, 20, width-20, height-20], outline="gray", width=1)
+            
+            # Security warning
+            warning_text = "⚠️ KEEP PRIVATE KEY SECRET - NEVER SHARE OR PHOTOGRAPH ⚠️"
+            draw.text((self._center_x(warning_text, header_font, width), 100), warning_text, fill="red", font=header_font)
+            
+            # Section headers
+            draw.text((50, 150), "PUBLIC ADDRESS (Share this to receive GSC coins):", fill="green", font=header_font)
+            draw.text((50, 280), "PRIVATE KEY (Keep this secret!):", fill="red", font=header_font)
+            
+            # QR code labels
+            if include_qr:
+                draw.text((580, 270), "Address QR", fill="black", font=small_font)
+                draw.text((570, 430), "Private Key QR", fill="red", font=small_font)
+            
+            # Instructions (the numbered steps go out as one multiline draw on a 15 px pitch)
+            instructions = [
+                "1. Print this wallet and store it securely",
+                "2. Send GSC coins to the public address above",
+                "3. To spend coins, import the private key into your wallet",
+                "4. Never share or photograph the private key",
+                "5. Keep multiple copies in different safe locations"
+            ]
+            
+            draw.text((50, 480), "INSTRUCTIONS:", fill="black", font=header_font)
+            draw.multiline_text((50, 495), "\n".join(instructions), fill="darkblue", font=small_font,
+                                spacing=self._line_spacing(small_font, 15))
+            
+            # Footer
+            footer_text = "GSC Coin - Secure Cryptocurrency Storage"
+            draw.text((self._center_x(footer_text, small_font, width), height - 30), footer_text, fill="gray", font=small_font)
+            
+            self._templates[include_qr] = template
+            return template
+    
+    def create_paper_wallet_image(self, address, private_key, include_qr=True, high_security=False, wallet_num=1,
+                                  generated_at=None):
+        """Create paper wallet image (generated_at is the timestamp text; defaults to now)"""
+        from PIL import ImageDraw
+        
+        # Start from a copy of the static layout and draw only what differs per wallet
+        img = self._wallet_template(include_qr).copy()
+        width = img.width
         draw = ImageDraw.Draw(img)
         
-        # Load fonts
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 24)
-            header_font = ImageFont.truetype("arial.ttf", 14)
-            text_font = ImageFont.truetype("arial.ttf", 12)
-            small_font = ImageFont.truetype("arial.ttf", 10)
-            code_font = ImageFont.truetype("courier.ttf", 10)
-        except:
-            title_font = ImageFont.load_default()
-            header_font = ImageFont.load_default()
-            text_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-            code_font = ImageFont.load_default()
-        
-        # Draw border
-        draw.rectangle([10, 10, width-10, height-10], outline="black", width=3)
-        draw.rectangle([20, 20, width-20, height-20], outline="gray", width=1)
+        # Load fonts (cached across wallets)
+        title_font = self._get_font("arial.ttf", 24)
+        small_font = self._get_font("arial.ttf", 10)
+        code_font = self._get_font("courier.ttf", 10)
         
         # Title
         title_text = f"GSC Coin Paper Wallet #{wallet_num}"
-        title_bbox = draw.textbbox((0, 0), title_text, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        draw.text(((width - title_width) // 2, 40), title_text, fill="black", font=title_font)
+        draw.text((self._center_x(title_text, title_font, width), 40), title_text, fill="black", font=title_font)
         
         # Subtitle
-        subtitle = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}"
-        subtitle_bbox = draw.textbbox((0, 0), subtitle, font=small_font)
-        subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-        draw.text(((width - subtitle_width) // 2, 75), subtitle, fill="gray", font=small_font)
-        
-        # Security warning
-        warning_text = "⚠️ KEEP PRIVATE KEY SECRET - NEVER SHARE OR PHOTOGRAPH ⚠️"
-        warning_bbox = draw.textbbox((0, 0), warning_text, font=header_font)
-        warning_width = warning_bbox[2] - warning_bbox[0]
-        draw.text(((width - warning_width) // 2, 100), warning_text, fill="red", font=header_font)
-        
-        # Public Address Section
-        draw.text((50, 150), "PUBLIC ADDRESS (Share this to receive GSC coins):", fill="green", font=header_font)
-        
-        # Split address into multiple lines if too long
-        addr_lines = [address[i:i+50] for i in range(0, len(address), 50)]
-        y_pos = 175
-        for line in addr_lines:
-            draw.text((50, y_pos), line, fill="black", font=code_font)
-            y_pos += 20
-        
-        # Private Key Section
-        draw.text((50, 280), "PRIVATE KEY (Keep this secret!):", fill="red", font=header_font)
-        
-        # Split private key into multiple lines
-        key_lines = [private_key[i:i+50] for i in range(0, len(private_key), 50)]
-        y_pos = 305
-        for line in key_lines:
-            draw.text((50, y_pos), line, fill="red", font=code_font)
-            y_pos += 20
+        if generated_at is None:
+            generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+        subtitle = f"Generated: {generated_at}"
+        draw.text((self._center_x(subtitle, small_font, width), 75), subtitle, fill="gray", font=small_font)
+        
+        # Address and private key wrapped at 50 characters, one draw call each on a 20 px pitch
+        code_spacing = self._line_spacing(code_font, 20)
+        
+        draw.multiline_text((50, 175), "\n".join(_CODE_LINES.findall(address)), fill="black", font=code_font, spacing=code_spacing)
+        
+        draw.multiline_text((50, 305), "\n".join(_CODE_LINES.findall(private_key)), fill="red", font=code_font, spacing=code_spacing)
         
         # QR Codes
         if include_qr:
             try:
                 # Address QR Code
-                addr_qr = qrcode.QRCode(version=1, box_size=4, border=2)
-                addr_qr.add_data(address)
-                addr_qr.make(fit=True)
-                addr_qr_img = addr_qr.make_image(fill_color="black", back_color="white")
-                addr_qr_img = addr_qr_img.resize((120, 120))
-                img.paste(addr_qr_img, (550, 140))
-                
-                draw.text((580, 270), "Address QR", fill="black", font=small_font)
+                self._paste_qr(img, address, (550, 140))
                 
                 # Private Key QR Code
-                key_qr = qrcode.QRCode(version=1, box_size=4, border=2)
-                key_qr.add_data(private_key)
-                key_qr.make(fit=True)
-                key_qr_img = key_qr.make_image(fill_color="black", back_color="white")
-                key_qr_img = key_qr_img.resize((120, 120))
-                img.paste(key_qr_img, (550, 300))
-                
-                draw.text((570, 430), "Private Key QR", fill="red", font=small_font)
+                self._paste_qr(img, private_key, (550, 300))
                 
             except Exception as e:
                 print(f"QR code generation failed: {e}")
         
-        # Instructions
-        instructions = [
-            "INSTRUCTIONS:",
-            "1. Print this wallet and store it securely",
-            "2. Send GSC coins to the public address above",
-            "3. To spend coins, import the private key into your wallet",
-            "4. Never share or photograph the private key",
-            "5. Keep multiple copies in different safe locations"
-        ]
-        
-        y_pos = 480
-        for instruction in instructions:
-            color = "black" if instruction.startswith("INSTRUCTIONS") else "darkblue"
-            font = header_font if instruction.startswith("INSTRUCTIONS") else small_font
-            draw.text((50, y_pos), instruction, fill=color, font=font)
-            y_pos += 15
-        
-        # Footer
-        footer_text = "GSC Coin - Secure Cryptocurrency Storage"
-        footer_bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-        footer_width = footer_bbox[2] - footer_bbox[0]
-        draw.text(((width - footer_width) // 2, height - 30), footer_text, fill="gray", font=small_font)
-        
         return img
     
     def show_wallet_details(self, wallets):
@@ -284,13 +465,21 @@ class PaperWalletGenerator:
         tree.column("#2", width=200)
         tree.column("#3", width=200)
         
-        # Add wallet data
-        for wallet in wallets:
-            tree.insert("", tk.END, values=(
-                wallet['address'][:30] + "...",
-                wallet['private_key'][:30] + "...",
-                wallet['filename']
-            ))
+        # Add wallet data (row iids are wallet indexes); rows go in a chunk at a time from idle
+        # callbacks so a large batch doesn't hold up the window
+        def insert_rows(start=0):
+            end = min(start + 200, len(wallets))
+            for i in range(start, end):
+                wallet = wallets[i]
+                tree.insert("", tk.END, iid=str(i), values=(
+                    wallet['address'][:30] + "...",
+                    wallet['private_key'][:30] + "...",
+                    wallet['filename']
+                ))
+            if end < len(wallets):
+                tree.after_idle(insert_rows, end)
+        
+        insert_rows()
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(details_frame, orient=tk.VERTICAL, command=tree.yview)
@@ -306,9 +495,7 @@ class PaperWalletGenerator:
         def copy_address():
             selection = tree.selection()
             if selection:
-                item = tree.item(selection[0])
-                wallet_idx = tree.index(selection[0])
-                address = wallets[wallet_idx]['address']
+                address = wallets[int(selection[0])]['address']
                 details_window.clipboard_clear()
                 details_window.clipboard_append(address)
                 messagebox.showinfo("Copied", "Address copied to clipboard")
@@ -10,15 +10,8 @@ import os
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from launch_gsc_coin import main
-    main()
-except ImportError as e:
-    print("Error importing GSC Coin modules: {}".format(e))
-    print("Please ensure all dependencies are installed:")
-    print("pip install -r requirements.txt")
-    sys.exit(1)
-except Exception as e:
+def _print_banner():
+    """Print the feature banner (run.py --banner)"""
     print("============================================================")
     print("=== GSC COIN - CUSTOM BLOCKCHAIN CRYPTOCURRENCY ===")
     print("============================================================")
@@ -35,5 +28,19 @@ except Exception as e:
     print("[+] Mandatory mining address enforcement")
     print("[+] Mempool import/export functionality")
     print("[+] Blockchain import/export functionality")
+
+if '--banner' in sys.argv:
+    _print_banner()
+    sys.exit(0)
+
+try:
+    from launch_gsc_coin import main
+    main()
+except ImportError as e:
+    print("Error importing GSC Coin modules: {}".format(e))
+    print("Please ensure all dependencies are installed:")
+    print("pip install -r requirements.txt")
+    sys.exit(1)
+except Exception as e:
     print("Error launching GSC Coin: {}".format(e))
     sys.exit(1)
@@ -7,11 +7,38 @@ import os
 import sys
 import subprocess
 import platform
+import time
+
+def run_streaming(cmd):
+    """Run cmd, echoing its output line by line as it is produced; raises CalledProcessError
+    on failure like subprocess.check_call"""
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True,
+                            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    with proc:
+        for line in proc.stdout:
+            print(line, end='', flush=True)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+# Local wheel cache filled on the first run and reused by later builds
+WHEEL_DIR = ".wheels"
 
 def install_dependencies():
-    """Install required dependencies"""
+    """Install required dependencies (from the local wheel cache once it is filled)"""
     print("Installing GSC Coin dependencies...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+    pip = [sys.executable, "-m", "pip"]
+    # Binary wheels over sdist builds; skip .pyc compilation (PyInstaller compiles what it bundles)
+    flags = ["--prefer-binary", "--no-compile", "--disable-pip-version-check"]
+    
+    if not os.path.isdir(WHEEL_DIR) or not os.listdir(WHEEL_DIR):
+        run_streaming(pip + ["wheel", "--prefer-binary", "--disable-pip-version-check",
+                             "-w", WHEEL_DIR, "-r", "requirements.txt"])
+    
+    try:
+        run_streaming(pip + ["install"] + flags + ["--no-index", "--find-links", WHEEL_DIR, "-r", "requirements.txt"])
+    except subprocess.CalledProcessError:
+        # requirements.txt changed since the cache was filled; resolve against the index
+        run_streaming(pip + ["install"] + flags + ["--find-links", WHEEL_DIR, "-r", "requirements.txt"])
 
 def build_executable():
     """Build executable for current platform"""
@@ -29,78 +56,95 @@ def build_executable():
     
     return True
 
+# PyInstaller spec shared by every platform; written by build_spec() and only rewritten when
+# it changes, so rebuilds reuse PyInstaller's cached analysis in build/
+SPEC_FILE = "gsccoin.spec"
+
+# Build stamp bundled into the exe; the launcher redeploys bundled data only when it changes
+VERSION_FILE = "deployment.ver"
+
+HIDDEN_IMPORTS = [
+    "tkinter",
+    "tkinter.ttk",
+    "tkinter.messagebox",
+    "tkinter.filedialog",
+    "cryptography",
+    "PIL",
+    "qrcode",
+    "matplotlib",
+    "numpy",
+]
+
+# Large packages nothing in the app imports (matplotlib and numpy are listed as launcher
+# dependencies, so they must stay bundled)
+EXCLUDED_MODULES = ["numpy.testing", "pytest", "IPython"]
+
+SPEC_TEMPLATE = """# Generated by setup.py - edit setup.py instead
+import sys
+
+a = Analysis(
+    ['launch_gsc_coin.py'],
+    datas=[('blockchain.py', '.'), ('wallet_manager.py', '.'), ('paper_wallet_generator.py', '.'),
+           ({version_file!r}, '.')],
+    hiddenimports={hidden_imports!r},
+    excludes={excludes!r},
+)
+pyz = PYZ(a.pure)
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    [],
+    name='GSCCoin',
+    # Windowed on Windows and macOS, console on Linux
+    console=sys.platform.startswith('linux'),
+)
+if sys.platform == 'darwin':
+    app = BUNDLE(exe, name='GSCCoin.app')
+"""
+
+def build_spec():
+    """Write the PyInstaller spec file if it is missing or out of date"""
+    spec = SPEC_TEMPLATE.format(hidden_imports=HIDDEN_IMPORTS, excludes=EXCLUDED_MODULES,
+                                version_file=VERSION_FILE)
+    try:
+        with open(SPEC_FILE, 'r') as f:
+            if f.read() == spec:
+                return SPEC_FILE
+    except OSError:
+        pass
+    
+    with open(SPEC_FILE, 'w') as f:
+        f.write(spec)
+    return SPEC_FILE
+
+def write_deployment_version():
+    """Stamp this build so the launcher can tell it apart from the data it deployed before"""
+    with open(VERSION_FILE, 'w') as f:
+        f.write(time.strftime('%Y%m%d%H%M%S'))
+
+def run_pyinstaller():
+    """Build from the spec file"""
+    write_deployment_version()
+    run_streaming([sys.executable, "-m", "PyInstaller", "--noconfirm", "--log-level=WARN", build_spec()])
+
 def build_windows():
     """Build Windows executable"""
     print("Building Windows executable...")
-    
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
-        "--onefile",
-        "--windowed",
-        "--name=GSCCoin",
-        "--add-data=blockchain.py;.",
-        "--add-data=wallet_manager.py;.",
-        "--add-data=paper_wallet_generator.py;.",
-        "--hidden-import=tkinter",
-        "--hidden-import=tkinter.ttk",
-        "--hidden-import=tkinter.messagebox",
-        "--hidden-import=tkinter.filedialog",
-        "--hidden-import=cryptography",
-        "--hidden-import=PIL",
-        "--hidden-import=qrcode",
-        "launch_gsc_coin.py"
-    ]
-    
-    subprocess.check_call(cmd)
+    run_pyinstaller()
     print("✓ Windows executable built: dist/GSCCoin.exe")
 
 def build_macos():
     """Build macOS application"""
     print("Building macOS application...")
-    
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
-        "--onefile",
-        "--windowed",
-        "--name=GSCCoin",
-        "--add-data=blockchain.py:.",
-        "--add-data=wallet_manager.py:.",
-        "--add-data=paper_wallet_generator.py:.",
-        "--hidden-import=tkinter",
-        "--hidden-import=tkinter.ttk",
-        "--hidden-import=tkinter.messagebox",
-        "--hidden-import=tkinter.filedialog",
-        "--hidden-import=cryptography",
-        "--hidden-import=PIL",
-        "--hidden-import=qrcode",
-        "launch_gsc_coin.py"
-    ]
-    
-    subprocess.check_call(cmd)
+    run_pyinstaller()
     print("✓ macOS application built: dist/GSCCoin.app")
 
 def build_linux():
     """Build Linux executable"""
     print("Building Linux executable...")
-    
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
-        "--onefile",
-        "--name=GSCCoin",
-        "--add-data=blockchain.py:.",
-        "--add-data=wallet_manager.py:.",
-        "--add-data=paper_wallet_generator.py:.",
-        "--hidden-import=tkinter",
-        "--hidden-import=tkinter.ttk",
-        "--hidden-import=tkinter.messagebox",
-        "--hidden-import=tkinter.filedialog",
-        "--hidden-import=cryptography",
-        "--hidden-import=PIL",
-        "--hidden-import=qrcode",
-        "launch_gsc_coin.py"
-    ]
-    
-    subprocess.check_call(cmd)
+    run_pyinstaller()
     print("✓ Linux executable built: dist/GSCCoin")
 
 def main():
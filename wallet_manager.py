@@ -1,15 +1,133 @@
 import os
 import json
+import atexit
+import contextlib
 import hashlib
-import secrets
+import hmac
+import struct
 import base64
+import weakref
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-import qrcode
-from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
-import pickle
+
+# hashlib's SHA-256 is OpenSSL's, which already runs on the SHA-NI instructions where the CPU has
+# them; a module-level reference saves the attribute lookups per digest
+_sha256 = hashlib.sha256
+
+# PBKDF2-HMAC-SHA256 for wallet passphrases; fastpbkdf2 when installed, else OpenSSL's via hashlib
+# (both precompute the HMAC pad states once and give identical keys)
+try:
+    from fastpbkdf2 import pbkdf2_hmac
+except ImportError:
+    from hashlib import pbkdf2_hmac
+
+KDF_ITERATIONS = 100000
+
+# Private keys in an encrypted wallet's blob are each prefixed with their length. Lowercase hex
+# keys (all generated ones) are stored as their raw bytes, flagged by the length's top bit,
+# which halves the plaintext the Fernet token has to encrypt and authenticate
+_KEY_LENGTH = struct.Struct('<H')
+_RAW_HEX_KEY = 0x8000
+
+def _pack_private_keys(private_keys) -> bytes:
+    """Length-prefix and concatenate private key strings"""
+    parts = []
+    for private_key in private_keys:
+        try:
+            raw = bytes.fromhex(private_key)
+        except ValueError:
+            raw = None
+        if raw is not None and raw.hex() == private_key:
+            parts.append(_KEY_LENGTH.pack(len(raw) | _RAW_HEX_KEY) + raw)
+        else:
+            encoded = private_key.encode()
+            parts.append(_KEY_LENGTH.pack(len(encoded)) + encoded)
+    return b''.join(parts)
+
+def _unpack_private_keys(blob: bytes) -> list:
+    """Inverse of _pack_private_keys"""
+    private_keys = []
+    offset = 0
+    while offset < len(blob):
+        (length,) = _KEY_LENGTH.unpack_from(blob, offset)
+        offset += _KEY_LENGTH.size
+        if length & _RAW_HEX_KEY:
+            length &= ~_RAW_HEX_KEY
+            private_keys.append(blob[offset:offset + length].hex())
+        else:
+            private_keys.append(blob[offset:offset + length].decode())
+        offset += length
+    return private_keys
+
+# Optional binary format for wallet and backup files: msgpack payloads are written behind a
+# one-byte tag, so legacy JSON files (which start with '{') are still read
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Optional fast JSON codec for the JSON path (stdlib json is the fallback)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_MSGPACK_TAG = b'\x01'
+
+def _write_wallet_file(path: str, data: dict):
+    """Write wallet or backup data (tagged msgpack if installed, else compact JSON)"""
+    if msgpack:
+        payload = _MSGPACK_TAG + msgpack.packb(data, use_bin_type=True)
+    elif orjson:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode()
+    # Write a temporary file next to the target and rename it into place, so a crash or a
+    # concurrent reader never sees a half-written wallet
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            # Wallets hold private keys: make sure the write reached the disk
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+def _read_wallet_file(path: str) -> dict:
+    """Read a file written by _write_wallet_file or a legacy JSON wallet/backup"""
+    with open(path, 'rb') as f:
+        payload = f.read()
+    if payload[:1] == _MSGPACK_TAG:
+        if msgpack is None:
+            raise Exception("msgpack is required to read this wallet file")
+        return msgpack.unpackb(payload[1:], raw=False)
+    if orjson:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+def _derive_key(passphrase: str, salt: bytes) -> bytes:
+    """Fernet key for a wallet passphrase and salt"""
+    return base64.urlsafe_b64encode(pbkdf2_hmac('sha256', passphrase.encode(), salt, KDF_ITERATIONS, 32))
+
+# Live WalletManagers; one exit hook flushes their unsaved changes without keeping them alive
+_open_managers = weakref.WeakSet()
+
+@atexit.register
+def _flush_open_managers():
+    for manager in list(_open_managers):
+        manager.flush()
+
+# Backup seed word list (32 words, so an index is 5 random bits)
+_SEED_WORDS = (
+    "abandon", "ability", "able", "about", "above", "absent", "absorb", "abstract",
+    "absurd", "abuse", "access", "accident", "account", "accuse", "achieve", "acid",
+    "acoustic", "acquire", "across", "act", "action", "actor", "actress", "actual",
+    "adapt", "add", "addict", "address", "adjust", "admit", "adult", "advance"
+)
 
 class WalletManager:
     """Professional wallet management system for GSC Coin"""
@@ -21,41 +139,81 @@ class WalletManager:
         self.is_encrypted = False
         self.encryption_key = None
         
+        # Derived Fernet keys keyed by (salt, SHA-256 of passphrase), so re-opening or
+        # re-checking a passphrase this session skips the 100k-iteration KDF
+        self._key_cache = {}
+        
+        # Unsaved changes to the open wallet, and how many batch() blocks are deferring saves
+        self._dirty = False
+        self._batch_depth = 0
+        
+        # Addresses in the open wallet's sending_addresses, for O(1) duplicate checks
+        self._sending_set = set()
+        _open_managers.add(self)
+        
+        # (wallets_dir mtime_ns, wallet names) from the last list_wallets scan
+        self._list_cache = (None, [])
+        
         # Create wallets directory
         if not os.path.exists(self.wallets_dir):
             os.makedirs(self.wallets_dir)
     
-    def generate_address(self):
-        """Generate a new market-ready GSC address with proper format"""
+    def generate_address(self, private_key_bytes: bytes = None):
+        """Generate a new market-ready GSC address with proper format (private_key_bytes: 32
+        bytes from _bulk_keys, else a fresh key is drawn)"""
         # Generate cryptographically secure private key
-        private_key_bytes = os.urandom(32)
+        if private_key_bytes is None:
+            private_key_bytes = os.urandom(32)
+        return self._address_from_key(bytes(private_key_bytes))
+    
+    def generate_addresses(self, count: int) -> list:
+        """Generate count (address, private_key, public_key) triples in one call"""
+        keys = self._bulk_keys(count)
+        address_from_key = self._address_from_key
+        return [address_from_key(keys[i:i + 32].tobytes()) for i in range(0, 32 * count, 32)]
+    
+    def _bulk_keys(self, count: int) -> memoryview:
+        """Key material for count private keys from a single urandom call (32-byte stripes)"""
+        return memoryview(os.urandom(32 * count))
+    
+    def _address_from_key(self, private_key_bytes: bytes):
+        """Derive (address, private_key, public_key) from 32 private key bytes"""
         private_key = private_key_bytes.hex()
         
         # Generate public key hash (simplified but consistent)
-        public_key_hash = hashlib.sha256(private_key_bytes + b'GSC_PUBLIC').digest()
-        
-        # Create proper GSC address format
-        # Use first 20 bytes of hash for address generation
-        address_bytes = public_key_hash[:20]
-        
-        # Create checksum using double SHA256 (Bitcoin-like)
-        checksum_input = b'GSC' + address_bytes
-        checksum = hashlib.sha256(hashlib.sha256(checksum_input).digest()).digest()[:4]
-        
-        # Combine address bytes with checksum
-        full_address = address_bytes + checksum
+        public_key_hash = _sha256(private_key_bytes + b'GSC_PUBLIC').digest()
         
-        # Convert to readable format using hex encoding (more reliable than base58/base64)
-        address_hex = full_address.hex()
-        
-        # Create GSC address with proper prefix
-        address = f"GSC1{address_hex[:32]}"  # Fixed length GSC address
+        # Create proper GSC address format: the fixed-length address keeps 32 hex chars, i.e.
+        # the first 16 bytes of the hash, so the 4-byte checksum that followed the 20-byte
+        # payload never reached it and is not computed
+        address = "GSC1" + public_key_hash[:16].hex()
         
         # Generate public key for display
-        public_key = hashlib.sha256(private_key_bytes + b'GSC_PUBKEY').hexdigest()
+        public_key = _sha256(private_key_bytes + b'GSC_PUBKEY').hexdigest()
         
         return address, private_key, public_key
     
+    def verify_address(self, address: str, private_key: str = None) -> bool:
+        """Check an address is well formed and, if private_key is given, that it derives it"""
+        # Addresses are 'GSC1' + 32 hex chars (the first 16 bytes of the public key hash;
+        # the checksum bytes fall outside the fixed length)
+        if len(address) != 36 or not address.startswith('GSC1'):
+            return False
+        try:
+            if len(bytes.fromhex(address[4:])) != 16:
+                return False
+        except ValueError:
+            return False
+        if private_key is None:
+            return True
+        
+        try:
+            expected, _, _ = self._address_from_key(bytes.fromhex(private_key))
+        except ValueError:
+            return False
+        # Constant-time comparison, so the check does not leak how much of the address matched
+        return hmac.compare_digest(expected.encode(), address.encode())
+    
     def create_wallet(self, wallet_name: str, passphrase: str = None) -> dict:
         """Create a new market-ready wallet"""
         if not wallet_name:
@@ -69,12 +227,15 @@ class WalletManager:
         # Generate master address, private key, and public key
         master_address, master_private_key, master_public_key = self.generate_address()
         
+        # One creation timestamp for the wallet, its primary address and the result
+        created = datetime.now().isoformat()
+        
         # New wallets start with 0 balance (must receive coins or mine to get balance)
         initial_balance = 0.0  # Real market behavior - no free coins
         
         wallet_data = {
             'name': wallet_name,
-            'created': datetime.now().isoformat(),
+            'created': created,
             'version': '2.0',  # Market version
             'master_address': master_address,
             'master_private_key': master_private_key,
@@ -87,7 +248,7 @@ class WalletManager:
                     'public_key': master_public_key,
                     'label': 'Primary Address',
                     'balance': initial_balance,
-                    'created': datetime.now().isoformat()
+                    'created': created
                 }
             ],
             'sending_addresses': [],
@@ -100,12 +261,14 @@ class WalletManager:
             wallet_data = self.encrypt_wallet_data(wallet_data, passphrase)
         
         # Save wallet
-        with open(wallet_path, 'w') as f:
-            json.dump(wallet_data, f, indent=2)
+        _write_wallet_file(wallet_path, wallet_data)
         
+        # Write out the previously open wallet's pending changes before switching
+        self.flush()
         self.current_wallet = wallet_name
         self.wallet_data = wallet_data
         self.is_encrypted = passphrase is not None
+        self._sending_set = set()
         
         return {
             'wallet_name': wallet_name,
@@ -114,7 +277,7 @@ class WalletManager:
             'public_key': master_public_key,
             'balance': initial_balance,
             'backup_seed': self.generate_backup_seed(),
-            'created': datetime.now().isoformat(),
+            'created': created,
             'market_ready': True
         }
     
@@ -125,8 +288,7 @@ class WalletManager:
         if not os.path.exists(wallet_path):
             raise Exception(f"Wallet '{wallet_name}' not found")
         
-        with open(wallet_path, 'r') as f:
-            wallet_data = json.load(f)
+        wallet_data = _read_wallet_file(wallet_path)
         
         # Decrypt if encrypted
         if wallet_data.get('encrypted', False):
@@ -134,9 +296,12 @@ class WalletManager:
                 raise Exception("Wallet is encrypted. Passphrase required.")
             wallet_data = self.decrypt_wallet_data(wallet_data, passphrase)
         
+        # Write out the previously open wallet's pending changes before switching
+        self.flush()
         self.current_wallet = wallet_name
         self.wallet_data = wallet_data
         self.is_encrypted = wallet_data.get('encrypted', False)
+        self._sending_set = {addr['address'] for addr in wallet_data.get('sending_addresses', [])}
         
         return {
             'name': wallet_name,
@@ -164,16 +329,21 @@ class WalletManager:
     
     def close_wallet(self):
         """Close current wallet"""
+        self.flush()
         self.current_wallet = None
         self.wallet_data = {}
         self.is_encrypted = False
         self.encryption_key = None
+        self._key_cache.clear()
+        self._sending_set = set()
     
     def backup_wallet(self, backup_path: str) -> bool:
         """Backup current wallet"""
         if not self.current_wallet:
             raise Exception("No wallet is currently open")
         
+        self.flush()
+        
         try:
             # Create backup data
             backup_data = {
@@ -184,8 +354,7 @@ class WalletManager:
             }
             
             # Save backup
-            with open(backup_path, 'w') as f:
-                json.dump(backup_data, f, indent=2)
+            _write_wallet_file(backup_path, backup_data)
             
             return True
         except Exception as e:
@@ -197,15 +366,13 @@ class WalletManager:
             raise Exception("Backup file not found")
         
         try:
-            with open(backup_path, 'r') as f:
-                backup_data = json.load(f)
+            backup_data = _read_wallet_file(backup_path)
             
             wallet_name = new_wallet_name or backup_data['wallet_name']
             wallet_data = backup_data['wallet_data']
             
             # Save restored wallet
-            with open(f"{self.wallets_dir}/{wallet_name}.wallet", 'w') as f:
-                json.dump(wallet_data, f, indent=2)
+            _write_wallet_file(f"{self.wallets_dir}/{wallet_name}.wallet", wallet_data)
             
             return {
                 'name': wallet_name,
@@ -228,8 +395,7 @@ class WalletManager:
         self.is_encrypted = True
         
         # Save encrypted wallet
-        with open(f"{self.wallets_dir}/{self.current_wallet}.wallet", 'w') as f:
-            json.dump(self.wallet_data, f, indent=2)
+        _write_wallet_file(f"{self.wallets_dir}/{self.current_wallet}.wallet", self.wallet_data)
         
         return True
     
@@ -248,8 +414,7 @@ class WalletManager:
         self.wallet_data = self.encrypt_wallet_data(decrypted_data, new_passphrase)
         
         # Save wallet
-        with open(f"{self.wallets_dir}/{self.current_wallet}.wallet", 'w') as f:
-            json.dump(self.wallet_data, f, indent=2)
+        _write_wallet_file(f"{self.wallets_dir}/{self.current_wallet}.wallet", self.wallet_data)
         
         return True
     
@@ -258,12 +423,13 @@ class WalletManager:
         if not self.current_wallet:
             raise Exception("No wallet is currently open")
         
-        address, private_key = self.generate_address()
+        address, private_key, public_key = self.generate_address()
         
         # Add to wallet
         self.wallet_data['addresses'].append({
             'address': address,
             'private_key': private_key,
+            'public_key': public_key,
             'label': label or f"Address {len(self.wallet_data['addresses']) + 1}",
             'balance': 0.0,
             'created': datetime.now().isoformat()
@@ -279,7 +445,11 @@ class WalletManager:
         if not self.current_wallet:
             raise Exception("No wallet is currently open")
         
-        if address not in [addr['address'] for addr in self.wallet_data['sending_addresses']]:
+        if not self.verify_address(address):
+            return False
+        
+        if address not in self._sending_set:
+            self._sending_set.add(address)
             self.wallet_data['sending_addresses'].append({
                 'address': address,
                 'label': label,
@@ -314,22 +484,28 @@ class WalletManager:
     
     def create_paper_wallet(self, output_path: str) -> dict:
         """Create paper wallet with QR codes"""
+        # Only paper wallets need the imaging stack, so it is not loaded with the module
+        import qrcode
+        from PIL import Image, ImageDraw, ImageFont
+        
         if not self.current_wallet:
             raise Exception("No wallet is currently open")
         
         # Generate new address for paper wallet
-        address, private_key = self.generate_address()
+        address, private_key, _ = self.generate_address()
         
-        # Create QR codes
-        addr_qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        addr_qr.add_data(address)
-        addr_qr.make(fit=True)
-        addr_img = addr_qr.make_image(fill_color="black", back_color="white")
+        # Create QR codes, picking the largest module size that fits 150x150 instead of
+        # rendering large and resampling down; a nearest-neighbour stretch covers the rest
+        def make_qr(data):
+            qr = qrcode.QRCode(version=1, box_size=10, border=5)
+            qr.add_data(data)
+            qr.make(fit=True)
+            qr.box_size = max(1, 150 // (qr.modules_count + 2 * qr.border))
+            img = qr.make_image(fill_color="black", back_color="white").get_image()
+            return img if img.size == (150, 150) else img.resize((150, 150), Image.NEAREST)
         
-        key_qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        key_qr.add_data(private_key)
-        key_qr.make(fit=True)
-        key_img = key_qr.make_image(fill_color="black", back_color="white")
+        addr_img = make_qr(address)
+        key_img = make_qr(private_key)
         
         # Create paper wallet image
         paper_width, paper_height = 800, 600
@@ -356,9 +532,6 @@ class WalletManager:
         draw.text((50, 340), private_key[:32] + "...", fill="red", font=text_font)
         
         # Add QR codes
-        addr_img = addr_img.resize((150, 150))
-        key_img = key_img.resize((150, 150))
-        
         paper.paste(addr_img, (550, 100))
         paper.paste(key_img, (550, 300))
         
@@ -378,40 +551,37 @@ class WalletManager:
     
     def generate_backup_seed(self) -> str:
         """Generate backup seed phrase"""
-        words = [
-            "abandon", "ability", "able", "about", "above", "absent", "absorb", "abstract",
-            "absurd", "abuse", "access", "accident", "account", "accuse", "achieve", "acid",
-            "acoustic", "acquire", "across", "act", "action", "actor", "actress", "actual",
-            "adapt", "add", "addict", "address", "adjust", "admit", "adult", "advance"
-        ]
-        
-        seed_words = []
-        for _ in range(12):
-            seed_words.append(secrets.choice(words))
-        
-        return " ".join(seed_words)
+        # One urandom call for all 12 words; the low 5 bits of each 16-bit value pick a word
+        # (32 words divide 2**16 evenly, so the choice stays uniform)
+        indexes = struct.unpack('<12H', os.urandom(24))
+        return " ".join(_SEED_WORDS[i & 31] for i in indexes)
+    
+    def _wallet_key(self, passphrase: str, salt: bytes) -> bytes:
+        """Fernet key for passphrase and salt (memoized until the wallet is closed)"""
+        cache_key = (salt, _sha256(passphrase.encode()).digest())
+        key = self._key_cache.get(cache_key)
+        if key is None:
+            key = self._key_cache[cache_key] = _derive_key(passphrase, salt)
+        return key
     
     def encrypt_wallet_data(self, data: dict, passphrase: str) -> dict:
         """Encrypt wallet data with passphrase"""
         # Generate key from passphrase
         salt = os.urandom(16)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(passphrase.encode()))
+        key = self._wallet_key(passphrase, salt)
         
         # Encrypt sensitive data
         fernet = Fernet(key)
         encrypted_data = data.copy()
         
-        # Encrypt private keys
-        for addr_data in encrypted_data['addresses']:
-            addr_data['private_key'] = fernet.encrypt(addr_data['private_key'].encode()).decode()
+        # All private keys (master first, then each address in order) go into one length-prefixed
+        # plaintext encrypted as a single Fernet token, instead of one token per key
+        private_keys = [data['master_private_key']] + [addr['private_key'] for addr in data['addresses']]
+        encrypted_data['private_keys_blob'] = fernet.encrypt(_pack_private_keys(private_keys)).decode()
+        encrypted_data['addresses'] = [{k: v for k, v in addr.items() if k != 'private_key'}
+                                       for addr in data['addresses']]
+        del encrypted_data['master_private_key']
         
-        encrypted_data['master_private_key'] = fernet.encrypt(data['master_private_key'].encode()).decode()
         encrypted_data['salt'] = base64.b64encode(salt).decode()
         encrypted_data['encrypted'] = True
         
@@ -421,41 +591,71 @@ class WalletManager:
         """Decrypt wallet data with passphrase"""
         # Recreate key from passphrase and salt
         salt = base64.b64decode(data['salt'].encode())
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(passphrase.encode()))
+        key = self._wallet_key(passphrase, salt)
         
         # Decrypt data
         fernet = Fernet(key)
         decrypted_data = data.copy()
         
-        # Decrypt private keys
-        for addr_data in decrypted_data['addresses']:
-            addr_data['private_key'] = fernet.decrypt(addr_data['private_key'].encode()).decode()
+        if 'private_keys_blob' in data:
+            private_keys = _unpack_private_keys(fernet.decrypt(data['private_keys_blob'].encode()))
+            # Addresses generated after the wallet was encrypted still carry their own private key;
+            # the blob holds the master key and then the keys of all other addresses, in order
+            sealed = [addr for addr in data['addresses'] if 'private_key' not in addr]
+            if len(private_keys) != 1 + len(sealed):
+                raise Exception("Encrypted private keys do not match the wallet's addresses")
+            address_keys = iter(private_keys[1:])
+            decrypted_data['master_private_key'] = private_keys[0]
+            decrypted_data['addresses'] = [dict(addr) if 'private_key' in addr else dict(addr, private_key=next(address_keys))
+                                           for addr in data['addresses']]
+            del decrypted_data['private_keys_blob']
+        else:
+            # Wallets encrypted before the single-blob format: one token per private key
+            decrypted_data['addresses'] = [dict(addr, private_key=fernet.decrypt(addr['private_key'].encode()).decode())
+                                           for addr in data['addresses']]
+            decrypted_data['master_private_key'] = fernet.decrypt(data['master_private_key'].encode()).decode()
         
-        decrypted_data['master_private_key'] = fernet.decrypt(data['master_private_key'].encode()).decode()
         decrypted_data['encrypted'] = False
         
         return decrypted_data
     
     def save_current_wallet(self):
-        """Save current wallet to file"""
+        """Mark the current wallet as changed; it is written once by the next flush()
+        (on switching or closing the wallet, backups, the end of a batch() block, and exit)"""
         if self.current_wallet:
-            with open(f"{self.wallets_dir}/{self.current_wallet}.wallet", 'w') as f:
-                json.dump(self.wallet_data, f, indent=2)
+            self._dirty = True
+    
+    def flush(self):
+        """Write the current wallet if it has unsaved changes"""
+        if self._dirty and self.current_wallet:
+            _write_wallet_file(f"{self.wallets_dir}/{self.current_wallet}.wallet", self.wallet_data)
+        self._dirty = False
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """Coalesce the saves of bulk operations into one write when the block exits:
+        with wallet_manager.batch():
+            for label in labels:
+                wallet_manager.generate_new_address(label)"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
     
     def list_wallets(self) -> list:
         """List all available wallets"""
-        wallets = []
-        for filename in os.listdir(self.wallets_dir):
-            if filename.endswith('.wallet'):
-                wallet_name = filename[:-7]  # Remove .wallet extension
-                wallets.append(wallet_name)
-        return wallets
+        # The directory's mtime changes whenever a wallet file is added, removed or
+        # renamed, so the last scan stays valid until then
+        mtime_ns = os.stat(self.wallets_dir).st_mtime_ns
+        if mtime_ns != self._list_cache[0]:
+            with os.scandir(self.wallets_dir) as entries:
+                wallets = [entry.name[:-7] for entry in entries  # Remove .wallet extension
+                           if entry.name.endswith('.wallet')]
+            self._list_cache = (mtime_ns, wallets)
+        return list(self._list_cache[1])
     
     def get_wallet_info(self) -> dict:
         """Get current wallet information"""